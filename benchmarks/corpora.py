@@ -0,0 +1,120 @@
+"""Generates the tiered benchmark corpora.
+
+Puzzles are produced locally from a seeded RNG so every run and every
+commit benchmarks the same inputs:
+
+    easy        random grids cut down to 38 clues keeping a unique solution
+    hard        known hard puzzles under random symmetry transforms
+    minimal     known 17 clue puzzles under random symmetry transforms
+    unsolvable  hard and minimal puzzles with one extra clue that breaks
+                their unique solution without directly clashing with a given
+
+    python benchmarks/corpora.py --count 200 --out benchmarks/corpora
+"""
+import argparse
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sudoku.canonical import random_transform
+from sudoku.data import CELL_PEERS
+from sudoku.generate import random_grid, remove_clues
+from sudoku.search import SearchSolver
+from sudoku.utils import parse_puzzle, format_puzzle
+
+TIERS = ("easy", "hard", "minimal", "unsolvable")
+
+EASY_CLUES = 38
+
+HARD_SEEDS = (
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+    "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..",
+    "....754..........8.8.19....3....1.6........34....6817.2.4...6.39......2.53.2.....",
+    "3.........5.7.3..8....28.7.7......43...........39.41.54..3..8..1...4....968...2..",
+    "85...24..72......9..4.........1.7..23.5...9...4...........8..7..17..........36.4.",
+    "..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..",
+    "12.3....435....1....4........54..2..6...7.........8.9...31..5.......9.7.....6...8",
+)
+
+MINIMAL_SEEDS = (
+    ".......1.4.........2...........5.4.7..8...3....1.9....3..4..2...5.1........8.6...",
+    ".......1.4.........2...........5.6.4..8...3....1.9....3..4..2...5.1........8.7...",
+    ".......12....35......6...7.7.....3.....4..8..1...........12.....8.....4..5....6..",
+    ".......12..36..........7...41..2.......5..3..7.....6..28.....4....3..5...........",
+    ".......12..8.3...........4.12.5..........47...6.......5.7...3.....62.......1.....",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+    "..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9",
+)
+
+
+def easy_puzzle(rng):
+    """Removes clues from a random grid in random order down to EASY_CLUES,
+    skipping any removal that would allow a second solution"""
+
+    return remove_clues(random_grid(rng), rng, min_clues=EASY_CLUES, symmetric=False)
+
+
+def transformed_seed(rng, seeds):
+    """One of seeds under a random symmetry, which keeps its difficulty"""
+
+    seed = parse_puzzle(rng.choice(seeds))
+    return random_transform(rng).apply(seed)
+
+
+def unsolvable_puzzle(rng):
+    """Adds a clue that differs from the seed's unique solution but does not
+    clash with any given, so the puzzle has no solution"""
+
+    cells = transformed_seed(rng, HARD_SEEDS + MINIMAL_SEEDS).data
+    solution = SearchSolver(cells).solve().data
+
+    empty = [idx for idx, value in enumerate(cells) if value is None]
+    rng.shuffle(empty)
+    for idx in empty:
+        used = set(cells[peer] for peer in CELL_PEERS[idx])
+        values = [value for value in range(1, 10) if value not in used and value != solution[idx]]
+        if values:
+            cells[idx] = rng.choice(values)
+            return cells
+    raise ValueError("Could not add a breaking clue")
+
+
+def generate(tier, count, seed=0):
+    """Returns a list of count puzzle lines for a tier"""
+
+    rng = random.Random(f"{tier}-{seed}")
+    if tier == "easy":
+        puzzles = [easy_puzzle(rng) for _ in range(count)]
+    elif tier == "hard":
+        puzzles = [transformed_seed(rng, HARD_SEEDS) for _ in range(count)]
+    elif tier == "minimal":
+        puzzles = [transformed_seed(rng, MINIMAL_SEEDS) for _ in range(count)]
+    elif tier == "unsolvable":
+        puzzles = [unsolvable_puzzle(rng) for _ in range(count)]
+    else:
+        raise ValueError(f"Unknown tier {tier}")
+    return [format_puzzle(puzzle, "line") for puzzle in puzzles]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write the benchmark corpora, one file per tier")
+    parser.add_argument("--count", type=int, default=200, help="Puzzles per tier")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(__file__), "corpora"), help="Output directory")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    for tier in TIERS:
+        path = os.path.join(args.out, f"{tier}.txt")
+        with open(path, "w") as file:
+            for line in generate(tier, args.count, args.seed):
+                file.write(line + "\n")
+        print(f"{path}: {args.count} puzzles")
+
+
+if __name__ == "__main__":
+    main()
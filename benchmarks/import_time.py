@@ -0,0 +1,76 @@
+"""Cold start benchmark for the core sudoku modules.
+
+Each run starts a fresh interpreter, imports the modules and reports the
+time spent above a bare interpreter start.  Bytecode is written by a warm
+up run first, as it would be for an installed package.  Exits with status 1 if the
+median is over the target or if any heavy optional dependency got
+imported along the way.
+
+    python benchmarks/import_time.py --target-ms 30
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CORE_MODULES = ("sudoku.data", "sudoku.solver", "sudoku.utils", "sudoku.batch")
+HEAVY_MODULES = ("numpy", "numba", "tkinter", "progress")
+
+
+# Run without PYTHONDONTWRITEBYTECODE so the warm up run caches bytecode
+ENV = dict((key, value) for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE")
+
+
+def time_command(code, runs):
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=ENV, check=True)
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=ENV, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def heavy_imports(modules):
+    code = "; ".join(
+        [f"import {module}" for module in modules]
+        + [f"import sys; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"]
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=ENV, check=True, capture_output=True, text=True)
+    return result.stdout.split()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Interpreter starts per measurement")
+    parser.add_argument("--target-ms", type=float, default=30.0, help="Maximum median import time")
+    parser.add_argument("modules", nargs="*", default=CORE_MODULES, help="Modules to import")
+    args = parser.parse_args(argv)
+
+    baseline = statistics.median(time_command("pass", args.runs))
+    timings = time_command("; ".join(f"import {module}" for module in args.modules), args.runs)
+    import_ms = 1000 * (statistics.median(timings) - baseline)
+
+    print(f"interpreter start: {1000 * baseline:.1f} ms")
+    print(f"import {', '.join(args.modules)}: {import_ms:.1f} ms (target {args.target_ms:.1f} ms)")
+
+    failed = False
+    heavy = heavy_imports(args.modules)
+    if heavy:
+        print(f"FAIL: heavy modules imported: {', '.join(heavy)}")
+        failed = True
+
+    if import_ms > args.target_ms:
+        print("FAIL: import time over target")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""Load test of the HTTP server in sudoku/server.py.
+
+Starts a server on a free localhost port, or uses the one given with
+--port, and sends requests over `--concurrency` keep-alive connections
+for puzzles from a corpora.py tier.  Reports requests/sec and the p50,
+p90, p99 and maximum latency, and can write the results as JSON.
+
+    python benchmarks/server_load.py --requests 2000 --concurrency 32
+    python benchmarks/server_load.py --port 8080 --endpoint count
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import corpora
+
+ENDPOINTS = ("solve", "validate", "count")
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def start_server(args):
+    # Runs the server in a subprocess and waits for the port it prints
+    command = [sys.executable, "-m", "sudoku", "serve", "--port", "0", "--window", str(args.window)]
+    if args.workers is not None:
+        command += ["--workers", str(args.workers)]
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    match = re.search(r":(\d+)$", line.strip())
+    if not match:
+        process.kill()
+        raise RuntimeError(f"Server did not start: {line!r}")
+    return process, int(match.group(1))
+
+
+async def request(reader, writer, host, path, payload):
+    body = json.dumps(payload).encode()
+    writer.write(
+        f"POST {path} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, path, puzzles, jobs, timings, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while jobs:
+            puzzle = puzzles[jobs.pop() % len(puzzles)]
+            start = time.perf_counter()
+            status = await request(reader, writer, host, path, {"puzzle": puzzle})
+            timings.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(host, port, endpoint, puzzles, requests, concurrency):
+    path = "/" + endpoint
+
+    # Warm up every worker before timing
+    await asyncio.gather(*(
+        client(host, port, path, puzzles, list(range(4)), [], [])
+        for _ in range(concurrency)
+    ))
+
+    jobs = list(range(requests))
+    timings = []
+    errors = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, path, puzzles, jobs, timings, errors)
+        for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(timings),
+        "errors": len(errors),
+        "requests_per_sec": len(timings) / elapsed,
+        "p50_ms": 1000 * statistics.median(timings),
+        "p90_ms": 1000 * percentile(timings, 0.90),
+        "p99_ms": 1000 * percentile(timings, 0.99),
+        "max_ms": 1000 * max(timings),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="Server address")
+    parser.add_argument("--port", type=int, help="Port of a running server, one is started otherwise")
+    parser.add_argument("--endpoint", default="solve", choices=ENDPOINTS)
+    parser.add_argument("--tier", default="hard", choices=corpora.TIERS)
+    parser.add_argument("--count", type=int, default=200, help="Distinct puzzles sent")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus RNG seed")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests sent in total")
+    parser.add_argument("--concurrency", type=int, default=32, help="Connections sending requests at once")
+    parser.add_argument("--workers", type=int, help="Worker processes of a started server")
+    parser.add_argument("--window", type=float, default=2.0, help="Batching window in milliseconds of a started server")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    puzzles = list(corpora.generate(args.tier, args.count, args.seed))
+
+    process = None
+    port = args.port
+    if port is None:
+        process, port = start_server(args)
+    try:
+        results = asyncio.run(run(args.host, port, args.endpoint, puzzles, args.requests, args.concurrency))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    results.update(endpoint=args.endpoint, tier=args.tier, concurrency=args.concurrency)
+    print(
+        f"{results['requests']} requests to /{args.endpoint} ({args.tier}), {results['errors']} errors, "
+        f"{results['requests_per_sec']:.1f} requests/sec\n"
+        f"p50 {results['p50_ms']:.2f} ms  p90 {results['p90_ms']:.2f} ms  "
+        f"p99 {results['p99_ms']:.2f} ms  max {results['max_ms']:.2f} ms"
+    )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    return 1 if results["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Solver benchmark over the tiered corpora from corpora.py.
+
+For every solver and tier it reports puzzles/sec, p50 and p99 latency and
+the peak memory traced while solving, and can write the results as JSON.
+Given a previous results file it flags solver/tier pairs whose throughput
+dropped or whose p99 latency grew by more than the tolerance, and exits
+with status 1.
+
+    python benchmarks/solvers.py --count 100 --output results.json
+    python benchmarks/solvers.py --count 100 --baseline results.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sudoku.solver import SOLVER_NAMES, get_solver
+from sudoku.utils import parse_puzzle
+
+import corpora
+
+DEFAULT_SOLVERS = SOLVER_NAMES
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run(solver_class, puzzles):
+    # Warm up, so one time costs such as JIT compilation are not timed
+    solver_class(puzzles[0]).solve()
+
+    timings = []
+    solved = 0
+    for puzzle in puzzles:
+        start = time.perf_counter()
+        solution = solver_class(puzzle).solve()
+        timings.append(time.perf_counter() - start)
+        if solution is not None:
+            solved += 1
+
+    # Memory is traced in a separate pass as tracing slows solving down
+    tracemalloc.start()
+    for puzzle in puzzles:
+        solver_class(puzzle).solve()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "puzzles": len(puzzles),
+        "solved": solved,
+        "puzzles_per_sec": len(puzzles) / sum(timings),
+        "p50_ms": 1000 * statistics.median(timings),
+        "p99_ms": 1000 * percentile(timings, 0.99),
+        "peak_kib": peak / 1024,
+    }
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def compare(results, baseline, tolerance):
+    """Returns a list of regression messages against a baseline results dict"""
+
+    previous = dict(((entry["solver"], entry["tier"]), entry) for entry in baseline["results"])
+    regressions = []
+    for entry in results["results"]:
+        before = previous.get((entry["solver"], entry["tier"]))
+        if before is None:
+            continue
+        name = f"{entry['solver']}/{entry['tier']}"
+        if entry["puzzles_per_sec"] < (1 - tolerance) * before["puzzles_per_sec"]:
+            regressions.append(f"{name}: {entry['puzzles_per_sec']:.1f} puzzles/sec, was {before['puzzles_per_sec']:.1f}")
+        if entry["p99_ms"] > (1 + tolerance) * before["p99_ms"]:
+            regressions.append(f"{name}: p99 {entry['p99_ms']:.2f} ms, was {before['p99_ms']:.2f} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--solvers", nargs="+", default=DEFAULT_SOLVERS, choices=SOLVER_NAMES)
+    parser.add_argument("--tiers", nargs="+", default=corpora.TIERS, choices=corpora.TIERS)
+    parser.add_argument("--count", type=int, default=100, help="Puzzles per tier")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus RNG seed")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a previous results JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    corpus = dict(
+        (tier, [parse_puzzle(line) for line in corpora.generate(tier, args.count, args.seed)])
+        for tier in args.tiers
+    )
+
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "count": args.count,
+        "seed": args.seed,
+        "results": [],
+    }
+
+    print(f"{'solver':<10} {'tier':<11} {'solved':>7} {'puzzles/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak KiB':>9}")
+    for solver in args.solvers:
+        try:
+            solver_class = get_solver(solver)
+        except ImportError as error:
+            print(f"{solver:<10} skipped: {error}")
+            continue
+
+        for tier in args.tiers:
+            entry = dict(solver=solver, tier=tier, **run(solver_class, corpus[tier]))
+            results["results"].append(entry)
+            print(
+                f"{solver:<10} {tier:<11} {entry['solved']:>7} {entry['puzzles_per_sec']:>10.1f} "
+                f"{entry['p50_ms']:>9.2f} {entry['p99_ms']:>9.2f} {entry['peak_kib']:>9.1f}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,5 +4,5 @@ setup(
     name = "Sudoku Solver",
     version = "0.1",
     description="Sudoku solver in python",
-    packages = ['sudoku']
+    packages = ['sudoku', 'sudoku.backends']
 )
\ No newline at end of file
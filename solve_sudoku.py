@@ -1,13 +1,45 @@
-from sudoku.solver import SudokuSolver
+import argparse
+
+from sudoku.budget import Budget, BudgetExceeded
+from sudoku.search import SearchSolver
+from sudoku.solver import SOLVER_NAMES, get_solver
 from sudoku.utils import read_from_file
 from sudoku.data import SudokuData
+from sudoku.stats import SolverStats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a sudoku puzzle file")
+    parser.add_argument("filename", nargs="?", default="./puzzles/puzzle2.txt")
+    parser.add_argument("--solver", choices=SOLVER_NAMES, default="passes")
+    parser.add_argument("--stats", action="store_true", help="Print solver stats as JSON")
+    parser.add_argument("--timeout", type=float, help="Give up after this many seconds")
+    parser.add_argument("--max-nodes", type=int, help="Give up after this many search nodes or iterations")
+    parser.add_argument("--workers", type=int, help="Split the search across this many processes instead of using --solver")
+    parser.add_argument("--split-depth", type=int, help="Guesses deep to split the search at, by default deep enough to keep the workers busy")
+    parser.add_argument("--unique", action="store_true", help="Only check whether the puzzle has a unique solution")
+    args = parser.parse_args()
+
+    with open(args.filename) as f:
+        puzzle = read_from_file(f)
 
+    stats = SolverStats() if args.stats else None
+    budget = Budget(args.timeout, args.max_nodes)
+    if args.workers:
+        from sudoku.parallel import ParallelSolver
+        solver = ParallelSolver(puzzle, stats=stats, budget=budget, workers=args.workers, depth=args.split_depth)
+    elif args.unique:
+        solver = SearchSolver(puzzle, stats=stats, budget=budget)
+    else:
+        solver = get_solver(args.solver)(puzzle, stats=stats, budget=budget)
 
-filename = "./puzzles/puzzle2.txt"
+    solution = solver.count_solutions(2) if args.unique else solver.solve()
+    if isinstance(solution, BudgetExceeded): print(f"Gave up after {solution.nodes} nodes in {solution.elapsed:.2f}s: out of {solution.reason}")
+    elif args.unique: print("Unique solution" if solution == 1 else "No solution" if solution == 0 else "Several solutions")
+    elif solution: solution.print()
+    else: print("No solution found")
+    if stats: print(stats.to_json(indent=2))
 
-with open(filename) as f:
-    puzzle = read_from_file(f)
 
-solver = SudokuSolver(puzzle)
-solution = solver.solve()
-if solution: solution.print()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
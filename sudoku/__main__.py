@@ -1,8 +1,158 @@
-from tkinter import Tk
-from sudoku.ui.app import Application
-
-r = Tk()
-app = Application(r)
-app.pack()
-r.title("Sudoku Solver")
-r.mainloop()
\ No newline at end of file
+import argparse
+import sys
+
+
+def run_ui(args):
+    from tkinter import Tk
+    from sudoku.ui.app import Application
+
+    r = Tk()
+    app = Application(r, box_size=getattr(args, "box_size", 3))
+    app.pack()
+    r.title("Sudoku Solver")
+    r.mainloop()
+
+
+def run_solve_batch(args):
+    from sudoku.batch import solve_file
+    from sudoku.stats import SolverStats
+
+    stats = SolverStats() if args.stats else None
+    output_file = open(args.output, "w") if args.output else sys.stdout
+    try:
+        with open(args.input) as input_file:
+            solve_file(
+                input_file,
+                output_file,
+                solver=args.solver,
+                workers=args.workers,
+                chunksize=args.chunk_size,
+                fmt=args.format,
+                stats=stats,
+                cache_size=args.cache_size,
+                store_path=args.store,
+                timeout=args.timeout,
+                max_nodes=args.max_nodes
+            )
+    finally:
+        if output_file is not sys.stdout:
+            output_file.close()
+
+    if stats:
+        with open(args.stats, "w") as stats_file:
+            stats_file.write(stats.to_json(indent=2) + "\n")
+
+
+def run_pack(args):
+    from sudoku.utils import iter_puzzles
+    from sudoku.packed import write_packed, ENCODING_BYTE, ENCODING_NIBBLE
+
+    encoding = ENCODING_NIBBLE if args.nibble else ENCODING_BYTE
+    with open(args.input) as input_file, open(args.output, "wb") as output_file:
+        write_packed(output_file, iter_puzzles(input_file), encoding=encoding)
+
+
+def run_generate(args):
+    from sudoku.generate import generate_batch
+    from sudoku.utils import format_puzzle
+
+    output_file = open(args.output, "w") if args.output else sys.stdout
+    try:
+        generated = generate_batch(
+            args.count,
+            seed=args.seed,
+            workers=args.workers,
+            chunksize=args.chunk_size,
+            difficulty=args.difficulty,
+            min_clues=args.min_clues,
+            symmetric=not args.asymmetric
+        )
+        for puzzle in generated:
+            line = format_puzzle(puzzle.puzzle, args.format)
+            if args.grade:
+                line = f"{line} {puzzle.difficulty} {puzzle.technique}"
+            output_file.write(line + "\n")
+    finally:
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+def run_serve(args):
+    from sudoku.server import serve
+
+    serve(
+        args.host,
+        args.port,
+        workers=args.workers,
+        window=args.window / 1000,
+        max_batch=args.max_batch,
+        solver=args.solver,
+        timeout=args.timeout,
+        max_nodes=args.max_nodes
+    )
+
+
+def main(argv=None):
+    from sudoku.batch import DEFAULT_SOLVER, DEFAULT_CHUNKSIZE
+    from sudoku.utils import PUZZLE_FORMATS
+    from sudoku.solver import SOLVER_NAMES
+    from sudoku.generate import DIFFICULTIES, DEFAULT_CHUNKSIZE as GENERATE_CHUNKSIZE
+
+    parser = argparse.ArgumentParser(prog="python -m sudoku", description="Sudoku solver")
+    parser.set_defaults(func=run_ui)
+    commands = parser.add_subparsers(title="commands")
+
+    ui = commands.add_parser("ui", help="Start the Tk application (default)")
+    ui.add_argument("--box-size", type=int, default=3, help="Subsquare size, 4 for 16x16 puzzles")
+    ui.set_defaults(func=run_ui)
+
+    batch = commands.add_parser("solve-batch", help="Solve a file with one puzzle per line")
+    batch.add_argument("input", help="Input puzzle file")
+    batch.add_argument("-o", "--output", help="Output file, defaults to stdout")
+    batch.add_argument("--solver", default=DEFAULT_SOLVER, choices=SOLVER_NAMES, help="Solver name")
+    batch.add_argument("-w", "--workers", type=int, default=None, help="Worker processes, defaults to the CPU count")
+    batch.add_argument("-c", "--chunk-size", type=int, default=DEFAULT_CHUNKSIZE, help="Puzzles sent to a worker at a time")
+    batch.add_argument("-f", "--format", default="comma", choices=PUZZLE_FORMATS, help="Output puzzle format")
+    batch.add_argument("--cache-size", type=int, default=0, help="Answer puzzles equivalent to ones already solved from a cache of this many")
+    batch.add_argument("--store", help="SQLite file of solutions kept between runs and shared by the workers")
+    batch.add_argument("--stats", help="Write solver stats for the whole batch to this JSON file")
+    batch.add_argument("--timeout", type=float, default=None, help="Give up on a puzzle after this many seconds")
+    batch.add_argument("--max-nodes", type=int, default=None, help="Give up on a puzzle after this many search nodes or iterations")
+    batch.set_defaults(func=run_solve_batch)
+
+    generate = commands.add_parser("generate", help="Generate puzzles with a unique solution, one per line")
+    generate.add_argument("count", type=int, help="Number of puzzles")
+    generate.add_argument("-o", "--output", help="Output file, defaults to stdout")
+    generate.add_argument("--seed", type=int, default=None, help="Seed giving a repeatable batch")
+    generate.add_argument("--difficulty", choices=DIFFICULTIES, help="Only keep puzzles graded at this difficulty")
+    generate.add_argument("--min-clues", type=int, default=17, help="Stop removing clues at this many")
+    generate.add_argument("--asymmetric", action="store_true", help="Remove clues one at a time instead of in symmetric pairs")
+    generate.add_argument("--grade", action="store_true", help="Follow each puzzle with its difficulty and hardest technique")
+    generate.add_argument("-w", "--workers", type=int, default=None, help="Worker processes, defaults to the CPU count")
+    generate.add_argument("-c", "--chunk-size", type=int, default=GENERATE_CHUNKSIZE, help="Puzzles generated by a worker at a time")
+    generate.add_argument("-f", "--format", default="line", choices=PUZZLE_FORMATS, help="Output puzzle format")
+    generate.set_defaults(func=run_generate)
+
+    server = commands.add_parser("serve", help="Serve solve, validate and count endpoints over HTTP/JSON")
+    server.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    server.add_argument("--port", type=int, default=8080, help="Port to listen on, 0 picks a free one")
+    server.add_argument("-w", "--workers", type=int, default=None, help="Worker processes, defaults to the CPU count, 0 solves in this process")
+    server.add_argument("--window", type=float, default=2.0, help="Milliseconds requests wait to be batched together")
+    server.add_argument("--max-batch", type=int, default=256, help="Most requests sent to the workers at a time")
+    server.add_argument("--solver", default=DEFAULT_SOLVER, choices=SOLVER_NAMES, help="Solver used when a request names none")
+    server.add_argument("--timeout", type=float, default=None, help="Most seconds spent on a request, requests may ask for less")
+    server.add_argument("--max-nodes", type=int, default=None, help="Most search nodes spent on a request, requests may ask for fewer")
+    server.set_defaults(func=run_serve)
+
+    pack = commands.add_parser("pack", help="Convert a puzzle text file to the packed binary format")
+    pack.add_argument("input", help="Input puzzle file")
+    pack.add_argument("output", help="Output binary file")
+    pack.add_argument("--nibble", action="store_true", help="Store 4 bits per cell instead of a byte")
+    pack.set_defaults(func=run_pack)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""Optional solver backends with extra dependencies.
+
+Backends are imported on first use through `sudoku.solver.get_solver` so
+the core package does not depend on them."""
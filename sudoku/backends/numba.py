@@ -0,0 +1,251 @@
+"""Candidate bitmask solver compiled with numba.
+
+Grids are int8 arrays of 81 cells, 0 for empty, as held by SudokuDataNP.
+Only 9x9 boards are supported, the candidate masks are 16 bit.
+When numba is not installed the same functions run as plain Python, which
+is correct but slow; check NUMBA_AVAILABLE to choose another solver.
+
+The compiled search can not look at the clock, so of a solve's budget only
+the node limit applies inside it, the deadline is checked before it starts."""
+import numpy as np
+
+from ..data import SudokuData, SudokuDataNP, UNITS, CELL_PEERS
+from ..budget import NULL_BUDGET, BudgetExceededError
+from ..stats import NULL_STATS
+
+try:
+    from numba import njit
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda function: function
+else:
+    NUMBA_AVAILABLE = True
+
+
+ALL_CANDIDATES = 0x1FF
+
+PEERS = np.array(CELL_PEERS, dtype=np.int16)
+UNIT_CELLS = np.array(UNITS, dtype=np.int16)
+
+# Results of _solve
+SOLVED = 1
+NO_SOLUTION = 0
+OUT_OF_NODES = -1
+
+# Number of candidates of each mask, and the value of each single bit mask
+MASK_COUNT = np.array([bin(mask).count("1") for mask in range(ALL_CANDIDATES + 1)], dtype=np.int8)
+BIT_VALUE = np.array([mask.bit_length() for mask in range(ALL_CANDIDATES + 1)], dtype=np.int8)
+
+
+@njit(cache=True)
+def _place(cells, candidates, idx, value, peers):
+    mask = 1 << (int(value) - 1)
+    cells[idx] = value
+    candidates[idx] = 0
+    for k in range(peers.shape[1]):
+        peer = peers[idx, k]
+        if candidates[peer] & mask:
+            candidates[peer] &= ~mask
+            if candidates[peer] == 0:
+                return False
+    return True
+
+
+@njit(cache=True)
+def _propagate(cells, candidates, peers, units, bit_value):
+    while True:
+        progress = False
+
+        # Naked singles
+        for idx in range(81):
+            if cells[idx]:
+                continue
+            mask = candidates[idx]
+            if mask == 0:
+                return False
+            if mask & (mask - 1) == 0:
+                if not _place(cells, candidates, idx, bit_value[mask], peers):
+                    return False
+                progress = True
+
+        if progress:
+            continue
+
+        # Hidden singles
+        for unit in range(units.shape[0]):
+            once = 0
+            twice = 0
+            placed = 0
+            for k in range(9):
+                idx = units[unit, k]
+                mask = candidates[idx]
+                twice |= once & mask
+                once |= mask
+                if cells[idx]:
+                    placed |= 1 << (int(cells[idx]) - 1)
+
+            if once | placed != ALL_CANDIDATES:
+                return False
+
+            hidden = once & ~twice
+            while hidden:
+                mask = hidden & -hidden
+                hidden ^= mask
+                found = False
+                for k in range(9):
+                    idx = units[unit, k]
+                    if candidates[idx] & mask:
+                        if not _place(cells, candidates, idx, bit_value[mask], peers):
+                            return False
+                        found = True
+                        progress = True
+                        break
+                if not found:
+                    return False
+
+        if not progress:
+            return True
+
+
+@njit(cache=True)
+def _select_cell(cells, candidates, mask_count):
+    best = -1
+    best_count = 10
+    for idx in range(81):
+        if cells[idx]:
+            continue
+        count = mask_count[candidates[idx]]
+        if count < best_count:
+            best = idx
+            best_count = count
+            if count <= 2:
+                break
+    return best
+
+
+@njit(cache=True)
+def _solve(grid, out, peers, units, mask_count, bit_value, max_nodes):
+    # One copy of the state per search depth, so backtracking is just
+    # dropping back a level.  Gives up after max_nodes guesses unless it
+    # is negative
+    cells = np.zeros((82, 81), dtype=np.int8)
+    candidates = np.full((82, 81), ALL_CANDIDATES, dtype=np.int16)
+    choice_idx = np.zeros(82, dtype=np.int16)
+    choice_mask = np.zeros(82, dtype=np.int16)
+
+    for idx in range(81):
+        value = grid[idx]
+        if value:
+            if value < 1 or value > 9 or not candidates[0, idx] & (1 << (int(value) - 1)):
+                return NO_SOLUTION
+            if not _place(cells[0], candidates[0], idx, value, peers):
+                return NO_SOLUTION
+
+    if not _propagate(cells[0], candidates[0], peers, units, bit_value):
+        return NO_SOLUTION
+
+    depth = 0
+    nodes = 0
+    select = True
+    while True:
+        if select:
+            idx = _select_cell(cells[depth], candidates[depth], mask_count)
+            if idx < 0:
+                out[:] = cells[depth]
+                return SOLVED
+            choice_idx[depth] = idx
+            choice_mask[depth] = candidates[depth, idx]
+
+        while depth >= 0 and choice_mask[depth] == 0:
+            depth -= 1
+        if depth < 0:
+            return NO_SOLUTION
+
+        nodes += 1
+        if max_nodes >= 0 and nodes > max_nodes:
+            return OUT_OF_NODES
+
+        mask = choice_mask[depth] & -choice_mask[depth]
+        choice_mask[depth] ^= mask
+
+        cells[depth + 1] = cells[depth]
+        candidates[depth + 1] = candidates[depth]
+        if (_place(cells[depth + 1], candidates[depth + 1], choice_idx[depth], bit_value[mask], peers)
+                and _propagate(cells[depth + 1], candidates[depth + 1], peers, units, bit_value)):
+            depth += 1
+            select = True
+        else:
+            select = False
+
+
+@njit(cache=True)
+def _solve_many(grids, out, solved, peers, units, mask_count, bit_value):
+    for row in range(grids.shape[0]):
+        solved[row] = _solve(grids[row], out[row], peers, units, mask_count, bit_value, -1) == SOLVED
+
+
+def solve_grid(grid):
+    """Solves a grid of 81 int8 cells, 0 for empty.
+    Returns the (81, ) int8 solution or None if the puzzle has no solution"""
+
+    grid = np.ascontiguousarray(grid, dtype=np.int8).reshape(81)
+    out = np.zeros(81, dtype=np.int8)
+    if _solve(grid, out, PEERS, UNIT_CELLS, MASK_COUNT, BIT_VALUE, -1) == SOLVED:
+        return out
+    return None
+
+
+def solve_grids(grids):
+    """Solves an (N, 81) array of grids, 0 for empty cells.
+
+    Returns the (N, 81) int8 solutions and an (N, ) bool array marking which
+    grids were solved, unsolved rows are left as zeros."""
+
+    grids = np.ascontiguousarray(grids, dtype=np.int8).reshape(-1, 81)
+    out = np.zeros(grids.shape, dtype=np.int8)
+    solved = np.zeros(len(grids), dtype=np.bool_)
+    _solve_many(grids, out, solved, PEERS, UNIT_CELLS, MASK_COUNT, BIT_VALUE)
+    return out, solved
+
+
+class NumbaSolver:
+    """Solves a puzzle with the compiled bitmask search"""
+
+    def __init__(self, puzzle_data, stats=None, budget=None):
+        if not isinstance(puzzle_data, SudokuDataNP):
+            puzzle_data = SudokuDataNP(puzzle_data)
+        if puzzle_data.geometry.box_size != 3:
+            raise ValueError("The numba solver only solves 9x9 puzzles")
+        self._puzzle_data = puzzle_data
+        self.stats = stats or NULL_STATS
+        self.budget = budget or NULL_BUDGET
+
+    @property
+    def puzzle_data(self):
+        return self._puzzle_data
+
+    def solve(self):
+        """Returns the solution as SudokuData, None if the puzzle has no
+        solution or BudgetExceeded if the budget ran out"""
+
+        budget = self.budget
+        grid = np.ascontiguousarray(self._puzzle_data.data, dtype=np.int8).reshape(81)
+        out = np.zeros(81, dtype=np.int8)
+        try:
+            budget.check()
+            remaining = budget.remaining_nodes()
+            # The compiled search keeps no counters, only its time is reported
+            with self.stats.phase("numba"):
+                result = _solve(grid, out, PEERS, UNIT_CELLS, MASK_COUNT, BIT_VALUE, -1 if remaining is None else remaining)
+            if result == OUT_OF_NODES:
+                budget.spend(remaining + 1)
+        except BudgetExceededError as error:
+            return budget.exceeded(error, self.stats)
+
+        if result != SOLVED:
+            return None
+        return SudokuData.from_cells(out)
@@ -0,0 +1,176 @@
+from collections import deque
+from functools import partial
+from itertools import islice
+import os
+
+from .budget import Budget
+from .data import SudokuData
+from .solver import get_solver
+from .stats import NULL_STATS, SolverStats
+from .utils import parse_puzzle, format_puzzle, iter_puzzle_lines
+
+DEFAULT_SOLVER = "search"
+DEFAULT_CHUNKSIZE = 256
+
+# Solution cache and store of this process, kept across chunks so a worker
+# answers repeats of the puzzles it has already solved
+_cache = None
+_store = None
+
+
+def iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _get_cache(size):
+    global _cache
+    from .cache import SolutionCache
+
+    if _cache is None or _cache.maxsize != size:
+        _cache = SolutionCache(size)
+    return _cache
+
+
+def _get_store(path):
+    global _store
+    from .store import SolutionStore
+
+    if _store is None or _store.path != path:
+        if _store is not None:
+            _store.close()
+        _store = SolutionStore(path)
+    return _store
+
+
+def _solve_puzzle(solver_class, puzzle, stats, cache, store, budget):
+    # Reads the puzzle through the store, then the cache, before solving
+    # it, so whatever the cache answers is written to the store as well
+    stats = stats or NULL_STATS
+
+    def solve():
+        return solver_class(puzzle, stats=stats, budget=budget).solve()
+
+    if cache is not None:
+        solve = partial(cache.read_through, puzzle, solve, stats)
+    if store is not None:
+        return store.read_through(puzzle, solve, stats)
+    return solve()
+
+
+def solve_chunk(solver, lines, fmt="comma", with_stats=False, cache_size=0, store_path=None, timeout=None, max_nodes=None):
+    """Solves a list of puzzle lines, returning a list of solution lines.
+    Puzzles without a solution give an empty line, as do puzzles given up
+    on after `timeout` seconds or `max_nodes` nodes of their solver.
+
+    With `with_stats` returns (solution lines, stats dict) instead, the
+    stats of every puzzle in the chunk merged together.  With a
+    `cache_size` puzzles equivalent to one already solved by this process
+    are answered from a `cache.SolutionCache` and only counted as cache
+    hits in the stats.  With a `store_path` solutions are also read from
+    and written to the `store.SolutionStore` at that path, the writes are
+    committed at the end of the chunk."""
+
+    solver_class = get_solver(solver)
+    stats = SolverStats() if with_stats else None
+    cache = _get_cache(cache_size) if cache_size else None
+    store = _get_store(store_path) if store_path else None
+    limited = timeout is not None or max_nodes is not None
+    results = []
+    for line in lines:
+        budget = Budget(timeout, max_nodes) if limited else None
+        try:
+            solution = _solve_puzzle(solver_class, parse_puzzle(line), stats, cache, store, budget)
+        except ValueError:
+            solution = None
+            if stats:
+                stats.count("invalid")
+        results.append(format_puzzle(solution, fmt) if solution else "")
+
+    if store is not None:
+        store.flush()
+
+    if stats:
+        stats.count("puzzles", len(lines))
+        stats.count("solved", sum(1 for result in results if result))
+        return results, stats.as_dict()
+    return results
+
+
+def _chunk_results(result, stats):
+    # Unpacks a solve_chunk result, merging its stats into stats
+    if stats is None:
+        return result
+    results, chunk_stats = result
+    stats.merge(chunk_stats)
+    return results
+
+
+def solve_batch(lines, solver=DEFAULT_SOLVER, workers=None, chunksize=DEFAULT_CHUNKSIZE, fmt="comma", stats=None, cache_size=0, store_path=None, timeout=None, max_nodes=None):
+    """Yields the solution line of each puzzle line, in input order.
+
+    Chunks of `chunksize` puzzles are solved in a pool of `workers`
+    processes.  Only a few chunks per worker are in flight at a time so
+    memory stays bounded however long the input is.  Lines may be in any
+    format accepted by `utils.parse_puzzle`, solutions are written in `fmt`.
+
+    If `stats` is a SolverStats each worker collects stats for its chunks
+    and they are merged into it as the chunks come back.  A `cache_size`
+    gives each worker a solution cache of that many puzzles, and with a
+    `store_path` the workers share the solution store at that path.
+    `timeout` and `max_nodes` bound the solve of each puzzle, so one
+    pathological puzzle can not hold up a worker."""
+
+    get_solver(solver)
+
+    workers = workers or os.cpu_count() or 1
+    chunks = iter_chunks(lines, chunksize)
+    with_stats = stats is not None
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from _chunk_results(solve_chunk(solver, chunk, fmt, with_stats, cache_size, store_path, timeout, max_nodes), stats)
+        return
+
+    # Imported here to keep multiprocessing out of sudoku.batch's import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(solve_chunk, solver, chunk, fmt, with_stats, cache_size, store_path, timeout, max_nodes))
+            if len(pending) >= 2 * workers:
+                yield from _chunk_results(pending.popleft().result(), stats)
+
+        while pending:
+            yield from _chunk_results(pending.popleft().result(), stats)
+
+
+def solve_array(puzzles, solver=DEFAULT_SOLVER):
+    """Solves an (N, 81) array of puzzles using 0 for empty cells, such as a
+    slice of `packed.load_packed`.  Returns an (N, 81) uint8 array of
+    solutions, puzzles without a solution are left as a row of zeros"""
+    import numpy as np
+
+    solver_class = get_solver(solver)
+    solutions = np.zeros((len(puzzles), 81), dtype=np.uint8)
+    for row, cells in enumerate(puzzles):
+        try:
+            solution = solver_class(SudokuData.from_cells(cells)).solve()
+        except ValueError:
+            continue
+        if solution:
+            solutions[row] = solution.data
+    return solutions
+
+
+def solve_file(input_file, output_file, **kwargs):
+    """Solves every puzzle line of input_file, writing the solutions to output_file in the same order.
+    Returns the number of puzzles processed"""
+
+    count = 0
+    for solution in solve_batch(iter_puzzle_lines(input_file), **kwargs):
+        output_file.write(solution + "\n")
+        count += 1
+    return count
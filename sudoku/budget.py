@@ -0,0 +1,121 @@
+"""Time and node budgets for solves.
+
+Solvers take an optional `budget` and call its `spend` once per search
+node, brute force iteration or pass.  Once the deadline has passed, the
+node limit is reached or `cancel` has been called, `spend` raises
+BudgetExceededError.  The solver's entry point catches it, reports what it
+did so far to its stats and returns a BudgetExceeded result in place of a
+solution.  BudgetExceeded is falsy, so code testing `if solution:` treats
+it as unsolved, while `isinstance(result, BudgetExceeded)` tells it apart
+from a puzzle without a solution.
+
+The default NULL_BUDGET never runs out.  A Budget covers everything spent
+against it, so give each solve its own.
+"""
+import time
+
+# Nodes spent between looks at the clock
+CHECK_INTERVAL = 64
+
+
+class BudgetExceededError(Exception):
+    """Raised by Budget.spend to unwind a solver, `reason` is "time",
+    "nodes" or "cancelled\""""
+
+    def __init__(self, reason):
+        Exception.__init__(self, f"Budget exceeded: {reason}")
+        self.reason = reason
+
+
+class BudgetExceeded:
+    """Result of a solve stopped by its budget, with the reason, the nodes
+    spent, the seconds elapsed and the solver's stats so far as a dict"""
+
+    def __init__(self, reason, nodes, elapsed, stats):
+        self.reason = reason
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.stats = stats
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return f"BudgetExceeded({self.reason!r}, nodes={self.nodes}, elapsed={self.elapsed:.3f})"
+
+    def as_dict(self):
+        return {
+            "reason": self.reason,
+            "nodes": self.nodes,
+            "elapsed": self.elapsed,
+            "stats": self.stats,
+        }
+
+
+class NullBudget:
+    """Budget that never runs out"""
+
+    def spend(self, amount=1):
+        pass
+
+    def check(self):
+        pass
+
+    def remaining_nodes(self):
+        return None
+
+
+NULL_BUDGET = NullBudget()
+
+
+class Budget(NullBudget):
+    """Allows `timeout` seconds from its creation and `max_nodes` nodes,
+    either left as None for no limit.  `cancel` may be called from another
+    thread to stop the solve at its next node"""
+
+    def __init__(self, timeout=None, max_nodes=None):
+        self.timeout = timeout
+        self.max_nodes = max_nodes
+        self.start = time.monotonic()
+        self.deadline = None if timeout is None else self.start + timeout
+        self.nodes = 0
+        self.cancelled = False
+        self._next_check = CHECK_INTERVAL
+
+    def cancel(self):
+        self.cancelled = True
+
+    def elapsed(self):
+        return time.monotonic() - self.start
+
+    def spend(self, amount=1):
+        """Counts amount nodes, raising BudgetExceededError if the budget has run out"""
+
+        self.nodes += amount
+        if self.cancelled:
+            raise BudgetExceededError("cancelled")
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise BudgetExceededError("nodes")
+        if self.nodes >= self._next_check:
+            self._next_check = self.nodes + CHECK_INTERVAL
+            self.check()
+
+    def check(self):
+        """Raises BudgetExceededError if cancelled or past the deadline"""
+
+        if self.cancelled:
+            raise BudgetExceededError("cancelled")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExceededError("time")
+
+    def remaining_nodes(self):
+        if self.max_nodes is None:
+            return None
+        return max(self.max_nodes - self.nodes, 0)
+
+    def exceeded(self, error, stats):
+        """Returns the BudgetExceeded result for a BudgetExceededError,
+        counting it in stats"""
+
+        stats.count("budget_exceeded")
+        return BudgetExceeded(error.reason, self.nodes, self.elapsed(), stats.as_dict())
@@ -0,0 +1,122 @@
+"""LRU cache of solutions keyed on the canonical form of puzzles.
+
+Equivalent puzzles share one entry, so a puzzle seen before in any
+relabelling, row or column shuffle or orientation is answered from the
+cache, mapped back to the caller's orientation without running a solver.
+Puzzles without a canonical form are never cached.
+"""
+from collections import OrderedDict
+
+from .canonical import canonicalize
+from .solver import get_solver
+from .stats import NULL_STATS
+from .utils import format_puzzle
+
+DEFAULT_CACHE_SIZE = 10000
+
+
+def cache_key(puzzle_data):
+    """Returns (key, transform) for a puzzle, the line format of its
+    canonical form and the transform taking it there, or None if it has
+    no canonical form"""
+
+    canonical = canonicalize(puzzle_data)
+    if canonical is None:
+        return None
+    puzzle, transform = canonical
+    return format_puzzle(puzzle, "line"), transform
+
+
+class SolutionCache:
+    """Holds the canonical solutions of up to `maxsize` puzzles, evicting
+    the least recently used"""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._solutions = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._solutions)
+
+    def clear(self):
+        self._solutions.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key):
+        """Returns the canonical solution cached under a `cache_key` key,
+        or None"""
+
+        solution = self._solutions.get(key)
+        if solution is None:
+            self.misses += 1
+        else:
+            self._solutions.move_to_end(key)
+            self.hits += 1
+        return solution
+
+    def insert(self, key, solution):
+        """Caches a canonical solution under a `cache_key` key"""
+
+        self._solutions[key] = solution
+        self._solutions.move_to_end(key)
+        while len(self._solutions) > self.maxsize:
+            self._solutions.popitem(last=False)
+
+    def get(self, puzzle_data):
+        """Returns the cached solution of a puzzle as SudokuData in the
+        puzzle's own orientation and digits, or None on a miss"""
+
+        canonical = cache_key(puzzle_data)
+        if canonical is None:
+            self.misses += 1
+            return None
+
+        key, transform = canonical
+        solution = self.lookup(key)
+        if solution is not None:
+            return transform.invert(solution)
+
+    def put(self, puzzle_data, solution):
+        """Caches the solution of a puzzle, returning False if the puzzle
+        has no canonical form"""
+
+        canonical = cache_key(puzzle_data)
+        if canonical is None:
+            return False
+
+        key, transform = canonical
+        self.insert(key, transform.apply(solution))
+        return True
+
+    def read_through(self, puzzle_data, solve, stats=NULL_STATS):
+        """Returns the cached solution of a puzzle, counted as a
+        "cache_hits" in stats, or else the result of calling solve(),
+        caching it if it is a solution.  The puzzle is canonicalized once
+        for both the lookup and the insert"""
+
+        canonical = cache_key(puzzle_data)
+        if canonical is None:
+            self.misses += 1
+            return solve()
+
+        key, transform = canonical
+        solution = self.lookup(key)
+        if solution is not None:
+            stats.count("cache_hits")
+            return transform.invert(solution)
+
+        solution = solve()
+        if solution:
+            self.insert(key, transform.apply(solution))
+        return solution
+
+    def solve(self, puzzle_data, solver="search", budget=None):
+        """Returns the solution of a puzzle from the cache, or solves it with
+        the named solver within budget and caches the result.  Returns None
+        if the puzzle has no solution and BudgetExceeded if the budget ran
+        out, neither is cached"""
+
+        return self.read_through(puzzle_data, lambda: get_solver(solver)(puzzle_data, budget=budget).solve())
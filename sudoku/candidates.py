@@ -0,0 +1,239 @@
+from .data import SudokuData, get_geometry, box_size_for
+
+# Candidates are stored as integers with bit (value - 1) set when value is
+# still possible for a cell, 9 bits for a 9x9 board and 16 or 25 bits for
+# the larger ones.
+ALL_CANDIDATES = 0x1FF
+
+# Lookup tables indexed by a 9 bit candidate mask
+MASK_VALUES = tuple(
+    tuple(value for value in range(1, 10) if mask & (1 << (value - 1)))
+    for mask in range(ALL_CANDIDATES + 1)
+)
+
+
+def bit(value):
+    return 1 << (value - 1)
+
+
+def value_from_bit(mask):
+    return mask.bit_length()
+
+
+def all_candidates(size):
+    """Mask of all values of a board with size values"""
+    return (1 << size) - 1
+
+
+def mask_values(mask):
+    """Returns the values of a candidate mask of any width as a tuple"""
+
+    if mask <= ALL_CANDIDATES:
+        return MASK_VALUES[mask]
+    values = []
+    while mask:
+        low = mask & -mask
+        values.append(low.bit_length())
+        mask ^= low
+    return tuple(values)
+
+
+class CandidateState:
+    """Candidate values of a puzzle stored as one bitmask per cell.
+
+    `cells` holds the placed value of each cell (0 for empty), `candidates`
+    the remaining possible values of each empty cell.  The `*_used` lists
+    hold a mask of the values already placed in each row, column and
+    subsquare.
+
+    When `trail` is a list every change is recorded on it as
+    (idx, previous candidates, placed value) so it can be rolled back with
+    `undo`.
+
+    `changes` counts every placement and elimination.  After `watch` is
+    called, cells left with a single candidate are queued on
+    `pending_cells` and the positions in `geometry.units` of units whose
+    candidates changed are added to `pending_units`.
+
+    The board size follows the puzzle, or box_size for an empty state."""
+
+    def __init__(self, puzzle_data=None, box_size=None):
+        if box_size is None:
+            if isinstance(puzzle_data, SudokuData):
+                box_size = puzzle_data.geometry.box_size
+            else:
+                box_size = 3 if puzzle_data is None else box_size_for(len(puzzle_data))
+        self._set_geometry(get_geometry(box_size))
+
+        size = self.geometry.size
+        self.cells = [0] * self.geometry.n_cells
+        self.candidates = [self.all_candidates] * self.geometry.n_cells
+        self.row_used = [0] * size
+        self.column_used = [0] * size
+        self.subsquare_used = [0] * size
+        self.trail = None
+        self.changes = 0
+        self.pending_cells = None
+        self.pending_units = None
+
+        if puzzle_data is not None:
+            for idx, value in enumerate(puzzle_data):
+                if value:
+                    if not self.candidates[idx] & bit(value):
+                        raise ValueError(f"Value {value} conflicts at index {idx}")
+                    self.place(idx, value)
+
+    def _set_geometry(self, geometry):
+        self.geometry = geometry
+        self.all_candidates = all_candidates(geometry.size)
+        self._cell_row = geometry.cell_row
+        self._cell_column = geometry.cell_column
+        self._cell_subsquare = geometry.cell_subsquare
+        self._cell_peers = geometry.cell_peers
+        self._cell_unit_ids = geometry.cell_unit_ids
+
+    def __len__(self):
+        return len(self.cells)
+
+    def copy(self):
+        state = CandidateState.__new__(CandidateState)
+        state._set_geometry(self.geometry)
+        state.cells = self.cells.copy()
+        state.candidates = self.candidates.copy()
+        state.row_used = self.row_used.copy()
+        state.column_used = self.column_used.copy()
+        state.subsquare_used = self.subsquare_used.copy()
+        state.trail = None
+        state.changes = self.changes
+        state.pending_cells = None
+        state.pending_units = None
+        return state
+
+    def values(self, idx):
+        """Returns the candidate values of a cell as a tuple"""
+        return mask_values(self.candidates[idx])
+
+    def count(self, idx):
+        return self.candidates[idx].bit_count()
+
+    def is_empty(self, idx):
+        return not self.cells[idx]
+
+    def is_solved(self):
+        return 0 not in self.cells
+
+    def empty_idxs(self):
+        return [idx for idx, value in enumerate(self.cells) if not value]
+
+    def place(self, idx, value):
+        """Places a value in a cell and removes it from the candidates of all peers.
+        Returns False if a peer is left without any candidates"""
+
+        mask = bit(value)
+        candidates = self.candidates
+        trail = self.trail
+        pending_cells = self.pending_cells
+
+        if trail is not None:
+            trail.append((idx, candidates[idx], value))
+        if pending_cells is not None:
+            self.pending_units.update(self._cell_unit_ids[idx])
+        self.changes += 1
+        self.cells[idx] = value
+        candidates[idx] = 0
+        self.row_used[self._cell_row[idx]] |= mask
+        self.column_used[self._cell_column[idx]] |= mask
+        self.subsquare_used[self._cell_subsquare[idx]] |= mask
+
+        ok = True
+        for peer in self._cell_peers[idx]:
+            if candidates[peer] & mask:
+                if trail is not None:
+                    trail.append((peer, candidates[peer], 0))
+                candidates[peer] &= ~mask
+                remaining = candidates[peer]
+                if not remaining:
+                    ok = False
+                if pending_cells is not None:
+                    if not remaining & (remaining - 1):
+                        pending_cells.append(peer)
+                    self.pending_units.update(self._cell_unit_ids[peer])
+        return ok
+
+    def eliminate(self, idx, value):
+        """Removes a candidate value from a cell.
+        Returns False if the cell is left without any candidates"""
+
+        mask = bit(value)
+        if self.cells[idx] or not self.candidates[idx] & mask:
+            return self.cells[idx] != 0 or self.candidates[idx] != 0
+        if self.trail is not None:
+            self.trail.append((idx, self.candidates[idx], 0))
+        self.changes += 1
+        self.candidates[idx] &= ~mask
+
+        remaining = self.candidates[idx]
+        if self.pending_cells is not None:
+            if not remaining & (remaining - 1):
+                self.pending_cells.append(idx)
+            self.pending_units.update(self._cell_unit_ids[idx])
+        return remaining != 0
+
+    def watch(self):
+        """Starts queueing changed cells and units, seeded with every
+        single candidate cell and every unit"""
+
+        self.pending_cells = [idx for idx, _ in self.iter_singles()]
+        self.pending_units = set(range(len(self.geometry.units)))
+
+    def mark(self):
+        """Starts recording changes if needed and returns the current trail position"""
+
+        if self.trail is None:
+            self.trail = []
+        return len(self.trail)
+
+    def undo(self, mark):
+        """Rolls back every change recorded after the given trail position"""
+
+        trail = self.trail
+        candidates = self.candidates
+        while len(trail) > mark:
+            idx, previous, value = trail.pop()
+            candidates[idx] = previous
+            if value:
+                mask = ~bit(value)
+                self.cells[idx] = 0
+                self.row_used[self._cell_row[idx]] &= mask
+                self.column_used[self._cell_column[idx]] &= mask
+                self.subsquare_used[self._cell_subsquare[idx]] &= mask
+
+    def iter_singles(self):
+        """Yields (idx, value) for each empty cell with a single candidate"""
+
+        for idx, mask in enumerate(self.candidates):
+            if mask and not mask & (mask - 1):
+                yield idx, value_from_bit(mask)
+
+    def iter_hidden_singles(self, units):
+        """Yields (idx, value) for each value that has a single possible cell
+        within one of the given units"""
+
+        candidates = self.candidates
+        for unit in units:
+            once = twice = 0
+            for idx in unit:
+                mask = candidates[idx]
+                twice |= once & mask
+                once |= mask
+            hidden = once & ~twice
+            while hidden:
+                mask = hidden & -hidden
+                hidden ^= mask
+                for idx in unit:
+                    if candidates[idx] & mask:
+                        yield idx, value_from_bit(mask)
+                        break
+
+    def to_data(self):
+        return SudokuData([value or None for value in self.cells], self.geometry.box_size)
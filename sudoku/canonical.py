@@ -0,0 +1,242 @@
+"""Canonical forms of puzzles under the Sudoku symmetry group.
+
+Two puzzles are equivalent if one can be turned into the other by
+relabelling digits, permuting rows within a band or columns within a stack,
+permuting bands or stacks, and transposing.  `canonicalize` returns the
+same canonical puzzle for every puzzle of an equivalence class, together
+with the Transform taking the puzzle there, so anything worked out for the
+canonical puzzle, such as its solution, can be mapped back.
+
+The canonical puzzle is the lexicographically smallest one over a subset of
+the group that depends only on the equivalence class: rows, columns, bands
+and stacks are first put in order of keys that no transform changes, such
+as clue counts and digit frequencies, and only orderings among equal keys
+are tried.  Puzzles with too many equal keys, as happens for nearly
+complete grids, have no canonical form and `canonicalize` returns None.
+"""
+from itertools import permutations, product
+from math import factorial
+
+from .data import SudokuData
+from .utils import format_puzzle
+
+# Most orderings tried before giving up on a puzzle
+MAX_TRANSFORMS = 4096
+
+
+class Transform:
+    """Maps cells between a puzzle and its canonical form.
+
+    Canonical cell (row, column) is taken from cell (rows[row],
+    columns[column]) of the puzzle, transposed first if `transposed`, with
+    its digit relabelled through `labels`, a tuple indexed by digit."""
+
+    def __init__(self, transposed, rows, columns, labels):
+        self.transposed = transposed
+        self.rows = rows
+        self.columns = columns
+        self.labels = labels
+
+        # Cell of the puzzle each canonical cell comes from
+        self.source_idxs = tuple(
+            9 * columns[column] + rows[row] if transposed else 9 * rows[row] + columns[column]
+            for row in range(9) for column in range(9)
+        )
+
+        self.inverse_labels = [0] * 10
+        for digit, label in enumerate(labels):
+            self.inverse_labels[label] = digit
+
+    def apply(self, data):
+        """Returns the canonical form of a puzzle or solution as SudokuData"""
+
+        cells = list(data)
+        labels = self.labels
+        return SudokuData([
+            None if cells[idx] is None else labels[cells[idx]]
+            for idx in self.source_idxs
+        ])
+
+    def invert(self, data):
+        """Returns a canonical puzzle or solution as SudokuData in the
+        orientation and digits of the original puzzle"""
+
+        cells = [None] * 81
+        inverse_labels = self.inverse_labels
+        for value, idx in zip(data, self.source_idxs):
+            if value is not None:
+                cells[idx] = inverse_labels[value]
+        return SudokuData(cells)
+
+
+def _shuffled_lines(rng):
+    # A random order of the 9 lines, shuffling the bands and the lines
+    # within each band
+    bands = [0, 1, 2]
+    rng.shuffle(bands)
+    order = []
+    for band in bands:
+        lines = [3 * band, 3 * band + 1, 3 * band + 2]
+        rng.shuffle(lines)
+        order.extend(lines)
+    return tuple(order)
+
+
+def random_transform(rng):
+    """Returns a random Transform from a `random.Random`: a digit
+    relabelling, row and column orders within bands and stacks, band and
+    stack orders and a transpose half of the time.  Applying it gives an
+    equivalent puzzle of the same difficulty"""
+
+    digits = list(range(1, 10))
+    rng.shuffle(digits)
+    rows = _shuffled_lines(rng)
+    columns = _shuffled_lines(rng)
+    transposed = rng.random() < 0.5
+    return Transform(transposed, rows, columns, (0, ) + tuple(digits))
+
+
+def _grid(data, transposed):
+    # Puzzle as a 9x9 list of rows with 0 for empty cells
+    cells = [value or 0 for value in data]
+    if transposed:
+        return [cells[column::9] for column in range(9)]
+    return [cells[9 * row:9 * (row + 1)] for row in range(9)]
+
+
+def _line_keys(lines, weights, other_keys):
+    # Key of each line that no allowed transform changes: the sorted cell
+    # keys within each third of the line, with the thirds sorted
+    keys = []
+    for line in lines:
+        thirds = []
+        for third in range(3):
+            thirds.append(tuple(sorted(
+                (weights[line[position]], other_keys[position])
+                for position in range(3 * third, 3 * third + 3)
+            )))
+        keys.append(tuple(sorted(thirds)))
+    return keys
+
+
+def _orderings(keys):
+    """Yields each ordering of range(len(keys)) sorting them by key, with
+    equal keys in every possible order"""
+
+    groups = {}
+    for position, key in enumerate(keys):
+        groups.setdefault(key, []).append(position)
+
+    choices = [permutations(groups[key]) for key in sorted(groups)]
+    for combination in product(*choices):
+        yield tuple(position for group in combination for position in group)
+
+
+def _count_orderings(keys):
+    count = 1
+    for key in set(keys):
+        count *= factorial(keys.count(key))
+    return count
+
+
+def _line_orders(line_keys):
+    # Orders of 9 lines grouped into bands of 3, bands are sorted by the
+    # sorted keys of their lines and lines sorted within each band
+    bands = [tuple(line_keys[3 * band:3 * band + 3]) for band in range(3)]
+    band_keys = [tuple(sorted(band)) for band in bands]
+
+    count = _count_orderings(band_keys)
+    for band in bands:
+        count *= _count_orderings(list(band))
+
+    def orders():
+        within = [list(_orderings(list(band))) for band in bands]
+        for band_order in _orderings(band_keys):
+            for line_orders in product(*(within[band] for band in band_order)):
+                yield tuple(
+                    3 * band + line
+                    for band, order in zip(band_order, line_orders)
+                    for line in order
+                )
+
+    return count, orders
+
+
+def canonicalize(puzzle_data, max_transforms=MAX_TRANSFORMS):
+    """Returns (canonical SudokuData, Transform) for a 9x9 puzzle, or None
+    if more than max_transforms orderings would have to be tried or the
+    puzzle is another size"""
+
+    data = list(puzzle_data)
+    if len(data) != 81:
+        return None
+
+    # Digit frequencies do not change with relabelling
+    frequencies = [0] * 10
+    for value in data:
+        if value is not None:
+            frequencies[value] += 1
+    weights = [0] + frequencies[1:]
+
+    candidates = []
+    total = 0
+    for transposed in (False, True):
+        grid = _grid(data, transposed)
+        columns = [list(column) for column in zip(*grid)]
+
+        # Line keys from the cells alone, then refined with the keys of the
+        # crossing lines
+        row_keys = _line_keys(grid, weights, [0] * 9)
+        column_keys = _line_keys(columns, weights, [0] * 9)
+        row_keys, column_keys = (
+            _line_keys(grid, weights, column_keys),
+            _line_keys(columns, weights, row_keys),
+        )
+
+        row_count, row_orders = _line_orders(row_keys)
+        column_count, column_orders = _line_orders(column_keys)
+        total += row_count * column_count
+        if total > max_transforms:
+            return None
+        candidates.append((transposed, grid, row_orders, list(column_orders())))
+
+    best = None
+    for transposed, grid, row_orders, column_orders in candidates:
+        for rows in row_orders():
+            ordered = [grid[row] for row in rows]
+            for columns in column_orders:
+                # Relabel digits in order of first appearance
+                labels = [0] * 10
+                next_label = 1
+                cells = []
+                for line in ordered:
+                    for column in columns:
+                        value = line[column]
+                        if value and not labels[value]:
+                            labels[value] = next_label
+                            next_label += 1
+                        cells.append(labels[value])
+                if best is None or cells < best[0]:
+                    best = (cells, transposed, rows, columns, labels)
+
+    cells, transposed, rows, columns, labels = best
+
+    # Digits missing from the puzzle take the remaining labels in order
+    next_label = max(labels) + 1
+    for digit in range(1, 10):
+        if not labels[digit]:
+            labels[digit] = next_label
+            next_label += 1
+
+    canonical = SudokuData([value or None for value in cells])
+    return canonical, Transform(transposed, rows, columns, tuple(labels))
+
+
+def canonical_key(puzzle_data, max_transforms=MAX_TRANSFORMS):
+    """Returns the canonical form of a puzzle as an 81 character string with
+    '.' for empty cells, or None if it has none"""
+
+    result = canonicalize(puzzle_data, max_transforms)
+    if result is None:
+        return None
+    return format_puzzle(result[0], "line")
@@ -1,9 +1,100 @@
-from mimetypes import init
-from tkinter import ALL
-import numpy as np
 import enum
-
-ALL_NUMBERS = set(range(1, 10))
+from operator import itemgetter
+
+
+class Geometry:
+    """Index tables of a board with subsquares of box_size x box_size cells.
+
+    A board has `size` = box_size ** 2 rows, columns and subsquares, holds
+    the values 1 to `size` and has `n_cells` = size ** 2 cells indexed row
+    by row.  Each unit is a tuple of the cell indices it covers, `units`
+    holds the rows, then the columns, then the subsquares.  Use
+    `get_geometry` to share the tables of a box size."""
+
+    def __init__(self, box_size):
+        if box_size < 2:
+            raise ValueError(f"Box size must be at least 2, not {box_size}")
+
+        size = box_size * box_size
+        self.box_size = box_size
+        self.size = size
+        self.n_cells = size * size
+        self.numbers = set(range(1, size + 1))
+        cells = range(self.n_cells)
+
+        self.row_idxs = tuple(tuple(range(size * row, size * (row + 1))) for row in range(size))
+        self.column_idxs = tuple(tuple(range(column, self.n_cells, size)) for column in range(size))
+        self.subsquare_idxs = tuple(
+            tuple(
+                size * box_size * (sub_square // box_size) + box_size * (sub_square % box_size) + size * i + j
+                for i in range(box_size) for j in range(box_size)
+            )
+            for sub_square in range(size)
+        )
+        self.superrow_idxs = tuple(
+            tuple(range(size * box_size * super_row, size * box_size * (super_row + 1)))
+            for super_row in range(box_size)
+        )
+        self.units = self.row_idxs + self.column_idxs + self.subsquare_idxs
+
+        self.cell_row = tuple(idx // size for idx in cells)
+        self.cell_column = tuple(idx % size for idx in cells)
+        self.cell_subsquare = tuple(
+            box_size * (idx // (size * box_size)) + (idx % size) // box_size for idx in cells
+        )
+
+        # The row, column and subsquare containing each cell
+        self.cell_units = tuple(
+            (self.row_idxs[self.cell_row[idx]], self.column_idxs[self.cell_column[idx]], self.subsquare_idxs[self.cell_subsquare[idx]])
+            for idx in cells
+        )
+
+        # Positions in units of the row, column and subsquare containing each cell
+        self.cell_unit_ids = tuple(
+            (self.cell_row[idx], size + self.cell_column[idx], 2 * size + self.cell_subsquare[idx])
+            for idx in cells
+        )
+
+        # The other cells sharing a row, column or subsquare with each cell
+        self.cell_peers = tuple(
+            tuple(sorted(set(row + column + sub_square).difference((idx, ))))
+            for idx, (row, column, sub_square) in enumerate(self.cell_units)
+        )
+
+        self.row_getters = tuple(itemgetter(*unit) for unit in self.row_idxs)
+        self.column_getters = tuple(itemgetter(*unit) for unit in self.column_idxs)
+        self.subsquare_getters = tuple(itemgetter(*unit) for unit in self.subsquare_idxs)
+        self.unit_getters = self.row_getters + self.column_getters + self.subsquare_getters
+
+
+_GEOMETRIES = {}
+
+
+def get_geometry(box_size=3):
+    """Returns the shared Geometry of a box size"""
+
+    geometry = _GEOMETRIES.get(box_size)
+    if geometry is None:
+        geometry = _GEOMETRIES[box_size] = Geometry(box_size)
+    return geometry
+
+
+def box_size_for(n_cells):
+    """Returns the box size of a board with n_cells cells, 3 for 81 cells,
+    4 for 256 and 5 for 625"""
+
+    box_size = round(n_cells ** 0.25)
+    if box_size < 2 or box_size ** 4 != n_cells:
+        raise ValueError(f"Wrong data length {n_cells}, expecting 81, 256, 625, ...")
+    return box_size
+
+
+# Tables of the standard 9x9 board
+GEOMETRY = get_geometry(3)
+
+ALL_NUMBERS = GEOMETRY.numbers
+UNITS = GEOMETRY.units
+CELL_PEERS = GEOMETRY.cell_peers
 
 class DataState(enum.Enum):
     ERROR = 0
@@ -12,22 +103,55 @@ class DataState(enum.Enum):
 
 
 class SudokuData:
-    ALL_NUMBERS = set(range(1,10))
+    """A board of box_size ** 4 cells, 81 for the standard 3 x 3 boxes.
+
+    When box_size is not given it follows from the length of the data.  The
+    index helpers look up the board's own tables in `geometry`, so they
+    work for every size."""
+
+    def __init__(self, initial_data=None, box_size=None):
+        if box_size is None:
+            box_size = 3 if initial_data is None else box_size_for(len(initial_data))
+        self.geometry = get_geometry(box_size)
+        n_cells = self.geometry.n_cells
 
-    def __init__(self, initial_data=None):
         if initial_data is not None:
-            if len(initial_data) != 81:
-                raise ValueError("Wrong data length, expecting 81")
+            if len(initial_data) != n_cells:
+                raise ValueError(f"Wrong data length, expecting {n_cells}")
 
         if isinstance(initial_data, SudokuData):
             initial_data = initial_data.data
+        elif initial_data is None:
+            initial_data = [None] * n_cells
+        elif not isinstance(initial_data, list):
+            initial_data = list(initial_data)
 
-        self._data = initial_data or (None, ) * 81
+        self._data = initial_data
         
         self._initial_idxs = set(map(lambda els: els[0],
             filter(lambda els: els[1] is not None, enumerate(initial_data) )
         ))
-        self._puzzle_idxs = set(range(81)).difference(self._initial_idxs)  # The initial indices of the puzzle, these are fixed and cannot be set
+        self._puzzle_idxs = set(range(n_cells)).difference(self._initial_idxs)  # The initial indices of the puzzle, these are fixed and cannot be set
+
+    @classmethod
+    def from_cells(cls, cells, box_size=None):
+        """Creates puzzle data from the cell values using 0 for empty cells,
+        such as a row of a packed puzzle array"""
+        return cls([int(value) or None for value in cells], box_size)
+
+    @property
+    def box_size(self):
+        return self.geometry.box_size
+
+    @property
+    def ALL_NUMBERS(self):
+        """The values 1 to size that every row, column and subsquare holds"""
+        return self.geometry.numbers
+
+    @property
+    def size(self):
+        """Number of rows, columns and values"""
+        return self.geometry.size
 
     def __iter__(self):
         return iter(self._data)
@@ -54,15 +178,15 @@ class SudokuData:
         return self._puzzle_idxs
 
     def copy(self):
-        return SudokuData(self._data.copy())
+        return SudokuData(self._data.copy(), self.geometry.box_size)
 
     def get(self, idx):
-        if idx < 0 or idx > 81:
+        if idx < 0 or idx >= len(self._data):
             raise ValueError("index out of bounds")
         return self._data[idx]
 
     def set(self, idx, value):
-        if idx < 0 or idx > 81:
+        if idx < 0 or idx >= len(self._data):
             raise ValueError("index out of bounds")
 
         if idx in self._initial_idxs:
@@ -75,8 +199,10 @@ class SudokuData:
     
     def as_pretty_str(self):
 
-        border_row = "".join(["+" + "-" * 5]*3 + ["+\n"]) 
-        data_row = "".join(["|{} {} {}"] * 3 + ['|\n'])
+        box_size = self.geometry.box_size
+        width = len(str(self.geometry.size))
+        border_row = "".join(["+" + "-" * (box_size * (width + 1) - 1)] * box_size + ["+\n"])
+        data_row = "".join(["|" + " ".join(["{:>%d}" % width] * box_size)] * box_size + ['|\n'])
         
         res = ""
         row_idx = 0
@@ -86,9 +212,9 @@ class SudokuData:
                 return " "
             else: return str(val)
 
-        for _ in range(3):
+        for _ in range(box_size):
             res += border_row
-            for subsquare in range(3):
+            for subsquare in range(box_size):
                 data_values = tuple(map(lambda val: val_or_empty(val), self.row(row_idx)))
                 row_idx += 1
                 res += data_row.format(*data_values)
@@ -99,106 +225,96 @@ class SudokuData:
     def print(self):
         print(self.as_pretty_str())
 
-    @classmethod
-    def row_from_idx(cls, idx):
-        return idx // 9
+    def row_from_idx(self, idx):
+        return self.geometry.cell_row[idx]
 
-    @classmethod
-    def column_from_idx(cls, idx):
-        return idx % 9
+    def column_from_idx(self, idx):
+        return self.geometry.cell_column[idx]
 
-    @classmethod
-    def subsquare_from_idx(cls, idx):
-        return 3 * (cls.row_from_idx(idx) // 3) + cls.column_from_idx(idx) // 3
+    def subsquare_from_idx(self, idx):
+        return self.geometry.cell_subsquare[idx]
 
-    @classmethod
-    def row_indices(cls, row, ignore=None):
-        if row < 0 or row >= 9:
+    def row_indices(self, row, ignore=None):
+        if row < 0 or row >= self.geometry.size:
             raise ValueError(f"Row index out of bounds {row}")
 
-        start = row * 9
-        for i in range(9):
-            idx = start + i
-            if ignore and idx in ignore: continue
-            yield idx
-    
+        row_idxs = self.geometry.row_idxs[row]
+        if not ignore:
+            return row_idxs
+        return tuple(idx for idx in row_idxs if idx not in ignore)
+
     def row(self, row, ignore_initials=False):
-        initials = self._initial_idxs if ignore_initials else None
-        for idx in SudokuData.row_indices(row, ignore = initials):
-            yield self._data[idx]
+        if not ignore_initials:
+            return self.geometry.row_getters[row](self._data)
+        return tuple(self._data[idx] for idx in self.geometry.row_idxs[row] if idx not in self._initial_idxs)
     
-    @classmethod
-    def column_indices(cls, column, ignore=None):
-        if column < 0 or column >= 9: 
+    def column_indices(self, column, ignore=None):
+        if column < 0 or column >= self.geometry.size:
             raise ValueError("Column index out of bounds")
-        offset = column
-        for i in range(9):
-            if ignore and i in ignore: continue
-            yield 9 * i + offset
+
+        column_idxs = self.geometry.column_idxs[column]
+        if not ignore:
+            return column_idxs
+        return tuple(idx for idx in column_idxs if idx not in ignore)
 
     def column(self, column, ignore_initials=False):
-        initials = self._initial_idxs if ignore_initials else None
-        for idx in SudokuData.column_indices(column, ignore=initials):
-            yield self._data[idx]
+        if not ignore_initials:
+            return self.geometry.column_getters[column](self._data)
+        return tuple(self._data[idx] for idx in self.geometry.column_idxs[column] if idx not in self._initial_idxs)
 
-    @classmethod
-    def subsquare_indices(cls, sub_square, ignore=None):
-        if sub_square < 0 or sub_square > 9:
+    def subsquare_indices(self, sub_square, ignore=None):
+        if sub_square < 0 or sub_square >= self.geometry.size:
             raise ValueError("Sub-square index is out of bounds")
-            
-        start = 27 * (sub_square // 3 ) + 3 * (sub_square % 3 )
-
-        for _ in range(3):
-            for j in range(3):
-                idx = start + j
-                if ignore and idx in ignore: continue
-                yield idx
-            start += 9
+
+        subsquare_idxs = self.geometry.subsquare_idxs[sub_square]
+        if not ignore:
+            return subsquare_idxs
+        return tuple(idx for idx in subsquare_idxs if idx not in ignore)
           
     def sub_square(self, sub_square, ignore_initials=False):
-        initials = self._initial_idxs if ignore_initials else None
-        for idx in SudokuData.subsquare_indices(sub_square, ignore=initials):
-            yield self._data[idx]
+        if not ignore_initials:
+            return self.geometry.subsquare_getters[sub_square](self._data)
+        return tuple(self._data[idx] for idx in self.geometry.subsquare_idxs[sub_square] if idx not in self._initial_idxs)
     
-    @classmethod
-    def is_row_in_subsquare(row_idx, subsquare_idx):
-        return row_idx // 3 == subsquare_idx // 3
+    def is_row_in_subsquare(self, row_idx, subsquare_idx):
+        box_size = self.geometry.box_size
+        return row_idx // box_size == subsquare_idx // box_size
 
-    @classmethod
-    def is_column_in_subsquare(column_idx, subsquare_idx):
-        return column_idx // 3 == subsquare_idx % 3
+    def is_column_in_subsquare(self, column_idx, subsquare_idx):
+        box_size = self.geometry.box_size
+        return column_idx // box_size == subsquare_idx % box_size
 
-    @classmethod
-    def superrow_indices(cls, super_row, ignore=None):
-        if 0 > super_row or super_row >= 3:
+    def superrow_indices(self, super_row, ignore=None):
+        if 0 > super_row or super_row >= self.geometry.box_size:
             raise ValueError("Super row index out of bounds")
 
-        start = 27 * super_row
-        for i in range(27):
-            idx = start + i
-            if ignore and idx in ignore: continue
-            yield idx
+        superrow_idxs = self.geometry.superrow_idxs[super_row]
+        if not ignore:
+            return superrow_idxs
+        return tuple(idx for idx in superrow_idxs if idx not in ignore)
     
     def super_row(self, super_row, ignore_initials=False):
-        initials = self._initial_idxs if ignore_initials else None
-        for idx in SudokuData.superrow_indices(super_row, ignore=initials):
-            yield self._data[idx]
+        if 0 > super_row or super_row >= self.geometry.box_size:
+            raise ValueError("Super row index out of bounds")
+
+        initials = self._initial_idxs if ignore_initials else ()
+        return tuple(self._data[idx] for idx in self.geometry.superrow_idxs[super_row] if idx not in initials)
 
     def are_rows_solved(self):
-        for row in range(9):
-            if set(self.row(row)) != self.ALL_NUMBERS:
+        for row in range(self.geometry.size):
+            if set(self.row(row)) != self.geometry.numbers:
                 return False
         return True
     
     def are_columns_solved(self):
-        for column in range(9):
-            if set(self.column(column)) != self.ALL_NUMBERS:
+        for column in range(self.geometry.size):
+            if set(self.column(column)) != self.geometry.numbers:
                 return False
         return True
 
     def are_subsquares_solved(self):
-        for subsquare in range(9):
-            if set(self.sub_square(subsquare)) != self.ALL_NUMBERS:
+        for subsquare in range(self.geometry.size):
+            if set(self.sub_square(subsquare)) != self.geometry.numbers:
                 return False
         return True
 
@@ -236,91 +352,196 @@ class SudokuData:
 
     def check_for_errors(self):
 
-        for i in range(9):
-            row = tuple(self.row(i))
-            if len(row) != len(set(row)): return False
-
-            column = tuple(self.column(i))
-            if len(column) != len(set(column)): return False
-
-            subsquare = tuple(self.sub_square(i))
-            if len(subsquare)  != len(set(subsquare)): return False
+        data = self._data
+        numbers = self.geometry.numbers
+        for getter in self.geometry.unit_getters:
+            values = [value for value in getter(data) if value is not None]
+            if len(values) != len(set(values)): return False
+            for value in values:
+                if value not in numbers: return False
         
         return True
 
     def check_complete(self):
 
-        for i in range(9):
-            if set(self.row(i)) != ALL_NUMBERS: return False
-            if set(self.column(i)) != ALL_NUMBERS: return False
-            if set(self.sub_square(i)) != ALL_NUMBERS: return False
+        data = self._data
+        numbers = self.geometry.numbers
+        for getter in self.geometry.unit_getters:
+            if set(getter(data)) != numbers: return False
 
         return True
 
-class SudokoSuperRow:
-    ALL_NUMBERS = set(range(1, 10))
+class CompactSudokuData:
+    """Memory efficient board with the same interface as SudokuData.
+
+    Cells are stored in a bytearray with 0 for empty cells and the fixed
+    initial cells as a bit mask, so a 9x9 board costs a few hundred bytes.
+    Values are still read and written as ints with None for empty."""
+
+    __slots__ = ("_cells", "_fixed", "geometry")
+
+    def __init__(self, initial_data=None, box_size=None):
+        if box_size is None:
+            box_size = 3 if initial_data is None else box_size_for(len(initial_data))
+        self.geometry = get_geometry(box_size)
+
+        if initial_data is None:
+            cells = bytearray(self.geometry.n_cells)
+        else:
+            if len(initial_data) != self.geometry.n_cells:
+                raise ValueError(f"Wrong data length, expecting {self.geometry.n_cells}")
+            if isinstance(initial_data, CompactSudokuData):
+                cells = initial_data._cells.copy()
+            elif isinstance(initial_data, (bytes, bytearray)):
+                cells = bytearray(initial_data)
+            else:
+                cells = bytearray(value or 0 for value in initial_data)
+
+            if max(cells) > self.geometry.size:
+                raise ValueError(f"Cell values must be between 1 and {self.geometry.size}")
 
-    def __init__(self, data):
-        if len(data) != 27:
-            raise ValueError("Expecting data length of 27")
+        fixed = 0
+        for idx, value in enumerate(cells):
+            if value:
+                fixed |= 1 << idx
 
-        self._data = data
+        self._cells = cells
+        self._fixed = fixed
+
+    @classmethod
+    def from_cells(cls, cells, box_size=None):
+        """Creates puzzle data from the cell values using 0 for empty cells"""
+        return cls(bytes(cells), box_size)
+
+    def __iter__(self):
+        return (value or None for value in self._cells)
+
+    def __len__(self):
+        return len(self._cells)
+
+    @property
+    def box_size(self):
+        return self.geometry.box_size
+
+    @property
+    def size(self):
+        return self.geometry.size
+
+    def __contains__(self, idx):
+        return self._cells[idx] != 0
+
+    def __eq__(self, other):
+        return self.data == list(other)
+
+    @property
+    def cells(self):
+        """The raw cell bytes, 0 for empty"""
+        return bytes(self._cells)
 
     @property
     def data(self):
-        return self._data
+        return [value or None for value in self._cells]
 
-    def __iter__(self):
-        return iter(self._data)
+    @property
+    def initial_idxs(self):
+        return set(idx for idx in range(len(self._cells)) if self._fixed >> idx & 1)
 
-    def __repr__(self):
-        return str(self._data)
+    @property
+    def puzzle_idxs(self):
+        return set(idx for idx in range(len(self._cells)) if not self._fixed >> idx & 1)
 
-    def row(self, row):
-        start = 9 * row
-        for idx in range(9):
-            yield self.data[start + idx]
-    
-    def subsquare(self, subsquare):
-        start = 3 * subsquare
-        for _ in range(3):
-            for idx in range(3):
-                yield self._data[start + idx]
-            start += 9
-    
-    def column(self, column):
-        for idx in range(9):
-            yield self._data[9 * idx + column]
-        
-    def is_valid(self):
-        # if not self.are_valid_rows(): return False
-        # if not self.are_valid_columns(): return False
-        if not self.are_valid_subsquares(): return False
+    def is_initial(self, idx):
+        return bool(self._fixed >> idx & 1)
 
-        return True
+    def copy(self):
+        data = CompactSudokuData.__new__(CompactSudokuData)
+        data._cells = self._cells.copy()
+        data._fixed = self._fixed
+        data.geometry = self.geometry
+        return data
 
-    def are_valid_rows(self):
-        for row in range(3):
-            if set(self.row(row)) != self.ALL_NUMBERS: return False
-        return True
+    def to_data(self):
+        return SudokuData(self.data, self.geometry.box_size)
+
+    def get(self, idx):
+        if idx < 0 or idx >= len(self._cells):
+            raise ValueError("index out of bounds")
+        return self._cells[idx] or None
+
+    def set(self, idx, value):
+        if idx < 0 or idx >= len(self._cells):
+            raise ValueError("index out of bounds")
+
+        if self._fixed >> idx & 1:
+            raise IndexError("Cannot write to a puzzle index")
+
+        try:
+            value = int(value)
+        except (ValueError, TypeError):
+            raise ValueError("Unable to convert value to integer")
+        if value < 1 or value > self.geometry.size:
+            raise ValueError(f"Cell values must be between 1 and {self.geometry.size}")
+        self._cells[idx] = value
+
+    as_pretty_str = SudokuData.as_pretty_str
+    print = SudokuData.print
+
+    def _unit(self, getter, idxs, ignore_initials):
+        if not ignore_initials:
+            return tuple(value or None for value in getter(self._cells))
+        return tuple(self._cells[idx] or None for idx in idxs if not self._fixed >> idx & 1)
+
+    def row(self, row, ignore_initials=False):
+        geometry = self.geometry
+        return self._unit(geometry.row_getters[row], geometry.row_idxs[row], ignore_initials)
+
+    def column(self, column, ignore_initials=False):
+        geometry = self.geometry
+        return self._unit(geometry.column_getters[column], geometry.column_idxs[column], ignore_initials)
+
+    def sub_square(self, sub_square, ignore_initials=False):
+        geometry = self.geometry
+        return self._unit(geometry.subsquare_getters[sub_square], geometry.subsquare_idxs[sub_square], ignore_initials)
+
+    def is_puzzle_solved(self):
+        return self.check_complete()
+
+    check = SudokuData.check
+
+    def check_for_errors(self):
+
+        cells = self._cells
+        for getter in self.geometry.unit_getters:
+            values = [value for value in getter(cells) if value]
+            if len(values) != len(set(values)): return False
 
-    def are_valid_subsquares(self):
-        for subsquare in range(3):
-            if set(self.subsquare(subsquare)) != self.ALL_NUMBERS: return False
         return True
 
-    def are_valid_columns(self):
-        for column in range(9):
-            if len(set(self.column(column))) != 3: return False
+    def check_complete(self):
+
+        cells = self._cells
+        numbers = self.geometry.numbers
+        for getter in self.geometry.unit_getters:
+            if set(getter(cells)) != numbers: return False
+
         return True
 
-    def dict(self):
-        return dict(((idx, el) for idx, el in enumerate(self._data) if el is not None))
-        
 
 class SudokuDataNP:
+    """A board as a (size, size) int8 array with 0 for empty cells, the
+    array representation shared with the NumPy and numba code"""
+
     def __init__(self, puzzle_data):
-        self.data = np.array(puzzle_data).reshape((9,9))
+        import numpy as np
+
+        if not isinstance(puzzle_data, np.ndarray):
+            puzzle_data = [value or 0 for value in puzzle_data]
+        self.data = np.array(puzzle_data, dtype=np.int8)
+        self.geometry = get_geometry(box_size_for(self.data.size))
+        self.data = self.data.reshape((self.geometry.size, self.geometry.size))
+
+    def to_data(self):
+        return SudokuData.from_cells(self.data.reshape(-1))
 
     def row(self, row):
         return self.data[row, :]
@@ -329,25 +550,31 @@ class SudokuDataNP:
         return self.data[:, column]
 
     def subsquare(self, subsquare):
-        row = subsquare // 3
-        column = subsquare % 3
+        box_size = self.geometry.box_size
+        row = subsquare // box_size
+        column = subsquare % box_size
 
-        return self.data[3 * row : 3 * (row + 1), 3 * column : 3 * (column + 1)].reshape(9)
+        return self.data[
+            box_size * row : box_size * (row + 1), box_size * column : box_size * (column + 1)
+        ].reshape(self.geometry.size)
 
     def is_row_solved(self, row):
-        return set(self.row(row)) == ALL_NUMBERS
+        return set(self.row(row)) == self.geometry.numbers
 
     def is_column_solved(self, column):
-        return set(self.column(column)) == ALL_NUMBERS
+        return set(self.column(column)) == self.geometry.numbers
 
     def is_subsquare_solved(self, subsquare):
-        return set(self.subsquare(subsquare)) == ALL_NUMBERS
+        return set(self.subsquare(subsquare)) == self.geometry.numbers
+
+    def check(self):
+        if self.geometry.box_size != 3:
+            return self.to_data().check()
+
+        from .vectorized import check_boards
+        return DataState(check_boards(self.data[None])[0])
 
     def is_puzzle_solved(self):
-        for i in range(9):
-            if not self.is_row_solved(i): return False
-            if not self.is_column_solved(i): return False
-            if not self.is_subsquare_solved(i): return False
-        return True
+        return self.check() == DataState.COMPLETE
 
     
\ No newline at end of file
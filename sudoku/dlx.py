@@ -0,0 +1,172 @@
+from .budget import NULL_BUDGET, BudgetExceededError
+from .data import SudokuData, GEOMETRY
+from .stats import NULL_STATS
+
+# Exact cover columns, 81 of each constraint type on a 9x9 board
+#   0 - 80:    cell idx holds a value
+#   81 - 161:  row holds value
+#   162 - 242: column holds value
+#   243 - 323: subsquare holds value
+# Larger boards have n_cells of each type in the same order
+
+
+def constraint_columns(idx, value, geometry=GEOMETRY):
+    """Returns the 4 constraint columns covered by placing value in cell idx"""
+
+    n_cells = geometry.n_cells
+    size = geometry.size
+    offset = value - 1
+    return (
+        idx,
+        n_cells + size * geometry.cell_row[idx] + offset,
+        2 * n_cells + size * geometry.cell_column[idx] + offset,
+        3 * n_cells + size * geometry.cell_subsquare[idx] + offset,
+    )
+
+
+class DLXSolver:
+    """Exact cover solver using Knuth's Algorithm X with dancing links.
+
+    The links are kept in flat lists indexed by node, node 0 is the root and
+    nodes 1 - 324 are the column headers, 4 * n_cells on larger boards.  Each matrix row is one
+    (idx, value) placement."""
+
+    def __init__(self, puzzle_data, stats=None, budget=None):
+        if isinstance(puzzle_data, SudokuData):
+            self._puzzle_data = puzzle_data
+        else:
+            self._puzzle_data = SudokuData(puzzle_data)
+        self.stats = stats or NULL_STATS
+        self.budget = budget or NULL_BUDGET
+        self.nodes = 0
+
+    @property
+    def puzzle_data(self):
+        return self._puzzle_data
+
+    def _build(self):
+        geometry = self._puzzle_data.geometry
+        n_constraints = 4 * geometry.n_cells
+        n_headers = n_constraints + 1
+        self.L = [idx - 1 for idx in range(n_headers)]
+        self.R = [idx + 1 for idx in range(n_headers)]
+        self.L[0] = n_constraints
+        self.R[n_constraints] = 0
+        self.U = list(range(n_headers))
+        self.D = list(range(n_headers))
+        self.C = list(range(n_headers))
+        self.S = [0] * n_headers
+        self.row_of = [None] * n_headers
+
+        all_values = range(1, geometry.size + 1)
+        for idx, given in enumerate(self._puzzle_data):
+            values = (given, ) if given is not None else all_values
+            for value in values:
+                self._add_row((idx, value), constraint_columns(idx, value, geometry))
+
+    def _add_row(self, row, columns):
+        L, R, U, D, C = self.L, self.R, self.U, self.D, self.C
+        first = len(L)
+        for offset, column in enumerate(columns):
+            header = column + 1
+            node = first + offset
+            L.append(node - 1 if offset else first + len(columns) - 1)
+            R.append(node + 1 if offset < len(columns) - 1 else first)
+            U.append(U[header])
+            D.append(header)
+            C.append(header)
+            D[U[header]] = node
+            U[header] = node
+            self.S[header] += 1
+            self.row_of.append(row)
+
+    def _cover(self, column):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[column]] = R[column]
+        L[R[column]] = L[column]
+        i = D[column]
+        while i != column:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, column):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[column]
+        while i != column:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[column]] = column
+        L[R[column]] = column
+
+    def _search(self, selected):
+        R, D, S = self.R, self.D, self.S
+        self.nodes += 1
+        self.budget.spend()
+
+        if R[0] == 0:
+            return True
+
+        # Choose the column with the fewest remaining rows
+        column = R[0]
+        size = S[column]
+        j = R[column]
+        while j != 0 and size > 1:
+            if S[j] < size:
+                column, size = j, S[j]
+            j = R[j]
+
+        if not size:
+            return False
+
+        self._cover(column)
+        i = D[column]
+        while i != column:
+            selected.append(self.row_of[i])
+            j = self.R[i]
+            while j != i:
+                self._cover(self.C[j])
+                j = self.R[j]
+
+            if self._search(selected):
+                return True
+
+            selected.pop()
+            j = self.L[i]
+            while j != i:
+                self._uncover(self.C[j])
+                j = self.L[j]
+            i = D[i]
+        self._uncover(column)
+
+        return False
+
+    def solve(self):
+        """Returns the first solution found as SudokuData, None if the
+        puzzle has no solution or BudgetExceeded if the budget ran out"""
+
+        try:
+            with self.stats.phase("dlx"):
+                self._build()
+                selected = []
+                found = self._search(selected)
+        except BudgetExceededError as error:
+            self.stats.count("nodes", self.nodes)
+            return self.budget.exceeded(error, self.stats)
+        self.stats.count("nodes", self.nodes)
+        if not found:
+            return None
+
+        data = list(self._puzzle_data)
+        for idx, value in selected:
+            data[idx] = value
+        return SudokuData(data, self._puzzle_data.box_size)
@@ -0,0 +1,186 @@
+"""Puzzle generation and difficulty grading.
+
+A puzzle is made by filling a random grid, then removing clues in a random
+order, keeping each removal only if the puzzle still has a single solution.
+Puzzles are graded by the hardest technique from `techniques.TECHNIQUES`
+needed to solve them, or "search" when the techniques stall.
+
+All randomness comes from a `random.Random`, and `generate_batch` seeds
+each puzzle from the batch seed and its position, so a batch is the same
+for any number of workers or chunk size.
+"""
+from collections import deque, namedtuple
+import os
+import random
+
+from .data import SudokuData, get_geometry
+from .candidates import CandidateState
+from .search import SearchSolver
+from .techniques import TECHNIQUES, TECHNIQUE_NAMES, apply_techniques
+
+DEFAULT_CHUNKSIZE = 64
+DEFAULT_ATTEMPTS = 1000
+
+# Difficulty of the hardest technique a puzzle needs, "search" is used when
+# the techniques alone do not solve it
+TECHNIQUE_DIFFICULTY = {
+    "naked_single": "easy",
+    "hidden_single": "easy",
+    "locked_candidates": "medium",
+    "naked_pair": "medium",
+    "hidden_pair": "medium",
+    "naked_triple": "hard",
+    "hidden_triple": "hard",
+    "x_wing": "expert",
+    "swordfish": "expert",
+    "search": "extreme",
+}
+
+DIFFICULTIES = ("easy", "medium", "hard", "expert", "extreme")
+
+GeneratedPuzzle = namedtuple("GeneratedPuzzle", ("puzzle", "solution", "technique", "difficulty"))
+
+
+def random_grid(rng, box_size=3):
+    """Returns a random complete grid as SudokuData"""
+
+    # The diagonal subsquares share no units, so they are filled at random
+    # and completed by the search.  Any such fill can be completed on a
+    # 9x9 board, other sizes may need another try
+    geometry = get_geometry(box_size)
+    while True:
+        cells = [None] * geometry.n_cells
+        for box in range(box_size):
+            values = list(range(1, geometry.size + 1))
+            rng.shuffle(values)
+            for idx, value in zip(geometry.subsquare_idxs[box * (box_size + 1)], values):
+                cells[idx] = value
+        solution = SearchSolver(SudokuData(cells, box_size)).solve()
+        if solution is not None:
+            return solution
+
+
+def _is_unique_without(cells, solution, idxs):
+    # The puzzle is still unique with idxs removed if no solution puts any
+    # other value in them.  Every removed cell is tried on its own, which
+    # only needs a search for one solution each instead of counting two
+    trial = list(cells)
+    for idx in idxs:
+        trial[idx] = None
+    state = CandidateState(SudokuData(trial))
+
+    for idx in idxs:
+        other = state.copy()
+        if other.eliminate(idx, solution[idx]) and SearchSolver(other).solve() is not None:
+            return False
+    return True
+
+
+def remove_clues(solution, rng, min_clues=17, symmetric=True):
+    """Removes clues from a solved grid in random order while the puzzle
+    keeps a unique solution, stopping at `min_clues`.  With `symmetric`
+    cells are removed in pairs mirrored through the centre.
+    Returns the puzzle as SudokuData"""
+
+    solution = list(solution)
+    cells = list(solution)
+    last = len(cells) - 1
+    order = list(range(len(cells)))
+    rng.shuffle(order)
+
+    clues = len(cells)
+    seen = set()
+    for idx in order:
+        if idx in seen:
+            continue
+        idxs = {idx, last - idx} if symmetric else {idx}
+        seen.update(idxs)
+        if clues - len(idxs) < min_clues:
+            continue
+        if _is_unique_without(cells, solution, idxs):
+            for removed in idxs:
+                cells[removed] = None
+            clues -= len(idxs)
+
+    return SudokuData(cells)
+
+
+def grade(puzzle_data, counts=None):
+    """Returns the name of the hardest technique needed to solve a puzzle,
+    or "search" if the techniques alone do not solve it.
+
+    If counts is a dict it is updated with the changes made by each
+    technique."""
+
+    counts = {} if counts is None else counts
+    if not apply_techniques(CandidateState(puzzle_data), TECHNIQUES, counts):
+        return "search"
+    if not counts:
+        return TECHNIQUE_NAMES[0]
+    return max(counts, key=TECHNIQUE_NAMES.index)
+
+
+def generate_puzzle(rng=None, difficulty=None, min_clues=17, symmetric=True, attempts=DEFAULT_ATTEMPTS, box_size=3):
+    """Generates one puzzle with a unique solution, 9x9 unless a box_size
+    is given.
+
+    With `difficulty` (one of DIFFICULTIES) puzzles are generated until one
+    grades at that difficulty, raising ValueError after `attempts` tries."""
+
+    if difficulty is not None and difficulty not in DIFFICULTIES:
+        raise ValueError(f"Unknown difficulty {difficulty}")
+    rng = rng or random.Random()
+
+    for _ in range(attempts):
+        solution = random_grid(rng, box_size)
+        puzzle = remove_clues(solution, rng, min_clues, symmetric)
+        technique = grade(puzzle)
+        if difficulty is None or TECHNIQUE_DIFFICULTY[technique] == difficulty:
+            return GeneratedPuzzle(puzzle, solution, technique, TECHNIQUE_DIFFICULTY[technique])
+
+    raise ValueError(f"No {difficulty} puzzle found in {attempts} attempts")
+
+
+def puzzle_rng(seed, index):
+    """Returns the RNG for the puzzle at index of a batch"""
+
+    return random.Random(f"{seed}:{index}")
+
+
+def generate_chunk(seed, start, count, **kwargs):
+    """Generates the puzzles at positions start to start + count of a batch"""
+
+    return [
+        generate_puzzle(puzzle_rng(seed, index), **kwargs)
+        for index in range(start, start + count)
+    ]
+
+
+def generate_batch(count, seed=None, workers=None, chunksize=DEFAULT_CHUNKSIZE, **kwargs):
+    """Yields `count` GeneratedPuzzles, generated in chunks over a pool of
+    `workers` processes.  Keyword arguments are passed to generate_puzzle.
+
+    The same seed gives the same puzzles in the same order whatever the
+    number of workers, without a seed a random one is used."""
+
+    if seed is None:
+        seed = random.randrange(2 ** 63)
+    workers = workers or os.cpu_count() or 1
+    chunks = ((start, min(chunksize, count - start)) for start in range(0, count, chunksize))
+
+    if workers == 1:
+        for start, size in chunks:
+            yield from generate_chunk(seed, start, size, **kwargs)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for start, size in chunks:
+            pending.append(executor.submit(generate_chunk, seed, start, size, **kwargs))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,133 @@
+"""Packed binary puzzle files.
+
+A file is a 16 byte header followed by fixed size puzzle records:
+
+    magic     4 bytes   b"SDKP"
+    version   uint8     1
+    encoding  uint8     ENCODING_BYTE or ENCODING_NIBBLE
+    cells     uint16    cells per puzzle, 81
+    count     uint64    number of puzzles
+
+All integers are little endian.  ENCODING_BYTE stores one byte per cell
+(81 bytes per puzzle) and can be memory mapped straight into an (N, 81)
+array.  ENCODING_NIBBLE stores 4 bits per cell, high nibble first (41 bytes
+per puzzle).  Empty cells are 0 in both encodings.
+"""
+import struct
+
+from .data import SudokuData
+
+MAGIC = b"SDKP"
+VERSION = 1
+ENCODING_BYTE = 1
+ENCODING_NIBBLE = 2
+
+HEADER = struct.Struct("<4sBBHQ")
+HEADER_SIZE = HEADER.size
+N_CELLS = 81
+
+RECORD_SIZES = {
+    ENCODING_BYTE: N_CELLS,
+    ENCODING_NIBBLE: (N_CELLS + 1) // 2,
+}
+
+
+def pack_puzzle(puzzle, encoding=ENCODING_BYTE):
+    """Packs a puzzle, a SudokuData or sequence of values with None or 0 for empty cells, into a record"""
+
+    cells = bytes(value or 0 for value in puzzle)
+    if len(cells) != N_CELLS:
+        raise ValueError("Wrong data length, expecting 81")
+
+    if encoding == ENCODING_BYTE:
+        return cells
+    if encoding == ENCODING_NIBBLE:
+        cells += b"\x00"
+        return bytes((cells[i] << 4) | cells[i + 1] for i in range(0, N_CELLS, 2))
+    raise ValueError(f"Unknown encoding {encoding}")
+
+
+def unpack_puzzle(record, encoding=ENCODING_BYTE):
+    """Unpacks a record into a tuple of 81 cell values, 0 for empty"""
+
+    if encoding == ENCODING_BYTE:
+        return tuple(record)
+    if encoding == ENCODING_NIBBLE:
+        cells = []
+        for byte in record:
+            cells.append(byte >> 4)
+            cells.append(byte & 0xF)
+        return tuple(cells[:N_CELLS])
+    raise ValueError(f"Unknown encoding {encoding}")
+
+
+def read_header(file):
+    """Reads the header of a binary file handle, returning (encoding, count)"""
+
+    header = file.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE:
+        raise ValueError("Truncated packed puzzle header")
+
+    magic, version, encoding, cells, count = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a packed puzzle file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported packed puzzle version {version}")
+    if encoding not in RECORD_SIZES or cells != N_CELLS:
+        raise ValueError(f"Unsupported packed puzzle layout, encoding {encoding} with {cells} cells")
+    return encoding, count
+
+
+def write_packed(file, puzzles, encoding=ENCODING_BYTE):
+    """Writes puzzles to a seekable binary file handle, returning the number written.
+    The puzzle count in the header is filled in once all puzzles are written"""
+
+    start = file.tell()
+    file.write(HEADER.pack(MAGIC, VERSION, encoding, N_CELLS, 0))
+
+    count = 0
+    for puzzle in puzzles:
+        file.write(pack_puzzle(puzzle, encoding))
+        count += 1
+
+    end = file.tell()
+    file.seek(start)
+    file.write(HEADER.pack(MAGIC, VERSION, encoding, N_CELLS, count))
+    file.seek(end)
+    return count
+
+
+def iter_packed(file):
+    """Lazily yields SudokuData for each puzzle of a binary file handle"""
+
+    encoding, count = read_header(file)
+    size = RECORD_SIZES[encoding]
+    for _ in range(count):
+        record = file.read(size)
+        if len(record) != size:
+            raise ValueError("Truncated packed puzzle file")
+        yield SudokuData.from_cells(unpack_puzzle(record, encoding))
+
+
+def load_packed(path):
+    """Memory maps a packed puzzle file as a read only (N, 81) uint8 array.
+
+    Byte encoded files are mapped without copying, nibble encoded files are
+    unpacked into a new array."""
+    import numpy as np
+
+    with open(path, "rb") as file:
+        encoding, count = read_header(file)
+
+    size = RECORD_SIZES[encoding]
+    if not count:
+        return np.zeros((0, N_CELLS), dtype=np.uint8)
+
+    records = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER_SIZE, shape=(count, size))
+    if encoding == ENCODING_BYTE:
+        return records
+
+    cells = np.empty((count, 2 * size), dtype=np.uint8)
+    cells[:, 0::2] = records >> 4
+    cells[:, 1::2] = records & 0xF
+    return cells[:, :N_CELLS]
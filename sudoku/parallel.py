@@ -0,0 +1,270 @@
+"""Parallel search of a single puzzle.
+
+The search tree is expanded to a frontier of subtrees, each the state after
+a few guesses, and the subtrees are searched in a pool of worker processes.
+When solving, the first solution found wins and the other workers are told
+to stop through a shared event, which their budgets check at the same
+interval as the clock.  When counting, the counts of the subtrees are
+added up and the workers are stopped once the limit is reached.
+
+Starting the pool costs tens of milliseconds, so this only pays off for
+puzzles whose search takes much longer than that, such as adversarial 9x9
+puzzles or sparse 16x16 and 25x25 ones.
+
+    ParallelSolver(puzzle, workers=8).solve()
+    ParallelSolver(puzzle, workers=8).count_solutions(limit=2)
+"""
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import closing
+import multiprocessing
+import os
+import time
+
+from .budget import NULL_BUDGET, Budget, BudgetExceeded, BudgetExceededError
+from .candidates import CandidateState, mask_values
+from .data import SudokuData
+from .search import SearchSolver, propagate, select_cell
+from .stats import NULL_STATS
+
+# Subtrees per worker the frontier is grown to when no depth is given, so
+# that workers finishing easy subtrees early pick up more
+SUBTREES_PER_WORKER = 4
+
+# Deepest the frontier is grown to when no depth is given
+MAX_SPLIT_DEPTH = 12
+
+# Most subtrees per worker the frontier is grown to, even with a depth
+MAX_SUBTREES_PER_WORKER = 64
+
+# Seconds between looks at the parent's budget while waiting on workers
+POLL_INTERVAL = 0.05
+
+# Set in each worker by _init_worker, once set every subtree search stops
+_cancel_event = None
+
+
+class _CancellableBudget(Budget):
+    # Budget of a worker that also stops when the parent sets the event
+    def check(self):
+        if _cancel_event is not None and _cancel_event.is_set():
+            raise BudgetExceededError("cancelled")
+        Budget.check(self)
+
+
+def _init_worker(event):
+    global _cancel_event
+    _cancel_event = event
+
+
+def _search_subtree(cells, counting, limit, timeout, max_nodes):
+    # Searches one subtree in a worker.  Returns (result, nodes) where the
+    # result is the solution's cells or None when solving, the number of
+    # solutions up to limit when counting, or a BudgetExceeded reason
+    solver = SearchSolver(CandidateState(cells), budget=_CancellableBudget(timeout, max_nodes))
+    if counting:
+        result = solver.count_solutions(limit)
+    else:
+        result = solver.solve()
+        if result:
+            result = list(result)
+    if isinstance(result, BudgetExceeded):
+        result = result.reason
+    return result, solver.nodes
+
+
+def split(state, depth=None, min_subtrees=1, max_subtrees=None, spend=None):
+    """Expands the search tree of a CandidateState a level at a time.
+
+    Returns (frontier, solutions): the states left after `depth` levels of
+    guesses, or when `depth` is None after the first level reaching
+    `min_subtrees` states, and the solutions found on the way as
+    SudokuData.  The frontier is empty if the tree is exhausted first.
+
+    Once a level grows past `max_subtrees` states the parents not expanded
+    yet are kept in the frontier as they are and the split stops.  `spend`
+    is called once per state expanded, the root included, and may raise
+    BudgetExceededError to stop the split"""
+
+    solutions = []
+    level = [state.copy()]
+    if spend is not None:
+        spend()
+    if not propagate(level[0]):
+        return [], solutions
+    if select_cell(level[0]) is None:
+        return [], [level[0].to_data()]
+
+    split_depth = 0
+    while level:
+        if depth is not None and split_depth >= depth:
+            break
+        if depth is None and (len(level) >= min_subtrees or split_depth >= MAX_SPLIT_DEPTH):
+            break
+
+        next_level = []
+        for position, parent in enumerate(level):
+            if max_subtrees is not None and len(next_level) >= max_subtrees:
+                return next_level + level[position:], solutions
+
+            idx = select_cell(parent)
+            for value in mask_values(parent.candidates[idx]):
+                if spend is not None:
+                    spend()
+                child = parent.copy()
+                if not child.place(idx, value) or not propagate(child):
+                    continue
+                if select_cell(child) is None:
+                    solutions.append(child.to_data())
+                else:
+                    next_level.append(child)
+        level = next_level
+        split_depth += 1
+
+    return level, solutions
+
+
+class ParallelSolver:
+    """Searches the subtrees of a puzzle in `workers` processes, defaulting
+    to the CPU count.
+
+    The frontier is `depth` guesses deep, or just deep enough to give each
+    worker SUBTREES_PER_WORKER subtrees when depth is None, and never holds
+    more than MAX_SUBTREES_PER_WORKER per worker.  The split is charged to
+    the budget a node per state expanded.  The budget's
+    deadline and cancellation are passed on to the workers and each subtree
+    gets an equal share of its remaining nodes.  Nodes are charged to the
+    budget as subtrees finish, and the workers are stopped once it runs
+    out."""
+
+    def __init__(self, puzzle_data, stats=None, budget=None, workers=None, depth=None):
+        if isinstance(puzzle_data, CandidateState):
+            self.state = puzzle_data.copy()
+        else:
+            try:
+                self.state = CandidateState(puzzle_data)
+            except ValueError:
+                # Conflicting givens, there is nothing to search
+                self.state = None
+
+        self.stats = stats or NULL_STATS
+        self.budget = budget or NULL_BUDGET
+        self.workers = workers or os.cpu_count() or 1
+        self.depth = depth
+        self.nodes = 0
+
+    def solve(self):
+        """Returns a solution as SudokuData, None if the puzzle has no
+        solution or BudgetExceeded if the budget ran out.  With several
+        solutions any one of them may be returned"""
+
+        try:
+            solution = self._solve()
+        except BudgetExceededError as error:
+            self.stats.count("nodes", self.nodes)
+            return self.budget.exceeded(error, self.stats)
+        self.stats.count("nodes", self.nodes)
+        return solution
+
+    def count_solutions(self, limit=2):
+        """Counts the solutions up to `limit`, or all with limit=None, as
+        search.SearchSolver.count_solutions does.  Returns BudgetExceeded if
+        the budget runs out first"""
+
+        try:
+            count = self._count(limit)
+        except BudgetExceededError as error:
+            self.stats.count("nodes", self.nodes)
+            return self.budget.exceeded(error, self.stats)
+        self.stats.count("nodes", self.nodes)
+        self.stats.count("solutions", count)
+        return count
+
+    def _solve(self):
+        if self.state is None:
+            return None
+
+        frontier, solutions = self._split()
+        if solutions:
+            return solutions[0]
+
+        with self.stats.phase("parallel"), closing(self._run(frontier, False, None)) as results:
+            for result in results:
+                if result is not None:
+                    return SudokuData(result, self.state.geometry.box_size)
+        return None
+
+    def _count(self, limit):
+        if self.state is None:
+            return 0
+
+        frontier, solutions = self._split()
+        count = len(solutions)
+        if limit is not None and count >= limit:
+            return limit
+
+        with self.stats.phase("parallel"), closing(self._run(frontier, True, limit)) as results:
+            for result in results:
+                count += result
+                if limit is not None and count >= limit:
+                    return limit
+        return count
+
+    def _split(self):
+        with self.stats.phase("split"):
+            frontier, solutions = split(
+                self.state,
+                self.depth,
+                SUBTREES_PER_WORKER * self.workers,
+                MAX_SUBTREES_PER_WORKER * self.workers,
+                self._spend
+            )
+        self.stats.count("subtrees", len(frontier))
+        return frontier, solutions
+
+    def _spend(self):
+        self.nodes += 1
+        self.budget.spend()
+
+    def _run(self, frontier, counting, limit):
+        """Yields the result of each subtree search as it finishes, raising
+        BudgetExceededError if the budget runs out.  Stops the workers when
+        the caller stops iterating"""
+
+        if not frontier:
+            return
+
+        # Workers get what is left of the deadline and a share of the nodes
+        deadline = getattr(self.budget, "deadline", None)
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        remaining = self.budget.remaining_nodes()
+        max_nodes = None if remaining is None else max(remaining // len(frontier), 1)
+
+        context = multiprocessing.get_context()
+        event = context.Event()
+        executor = ProcessPoolExecutor(
+            max_workers=min(self.workers, len(frontier)),
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(event, )
+        )
+        try:
+            pending = set(
+                executor.submit(_search_subtree, list(state.cells), counting, limit, timeout, max_nodes)
+                for state in frontier
+            )
+            while pending:
+                done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                self.budget.check()
+                for future in done:
+                    result, nodes = future.result()
+                    self.nodes += nodes
+                    if isinstance(result, str):
+                        self.budget.spend(nodes)
+                        raise BudgetExceededError(result)
+                    # A solution found with the last of the budget is still
+                    # handed back, its nodes are charged if the caller asks for more
+                    yield result
+                    self.budget.spend(nodes)
+        finally:
+            event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,319 @@
+from .budget import NULL_BUDGET, BudgetExceededError
+from .candidates import CandidateState, mask_values, value_from_bit
+from .stats import NULL_STATS
+
+
+def propagate(state):
+    """Places naked and hidden singles until none remain.
+    Returns False if the state turns out to have no solution"""
+
+    cells = state.cells
+    candidates = state.candidates
+    units = state.geometry.units
+    all_candidates = state.all_candidates
+    n_cells = len(cells)
+
+    while True:
+        progress = False
+
+        # Naked singles, cells with a single candidate left
+        for idx in range(n_cells):
+            if cells[idx]:
+                continue
+            mask = candidates[idx]
+            if not mask:
+                return False
+            if not mask & (mask - 1):
+                if not state.place(idx, value_from_bit(mask)):
+                    return False
+                progress = True
+
+        if progress:
+            continue
+
+        # Hidden singles, values with a single possible cell in a unit.
+        # used holds the values already placed in each unit, in the order
+        # of units, and is refreshed after every placement
+        used = state.row_used + state.column_used + state.subsquare_used
+        for position, unit in enumerate(units):
+            once = twice = 0
+            for idx in unit:
+                mask = candidates[idx]
+                twice |= once & mask
+                once |= mask
+
+            if once | used[position] != all_candidates:
+                return False
+
+            hidden = once & ~twice
+            if not hidden:
+                continue
+            while hidden:
+                mask = hidden & -hidden
+                hidden ^= mask
+                for idx in unit:
+                    if candidates[idx] & mask:
+                        if not state.place(idx, value_from_bit(mask)):
+                            return False
+                        progress = True
+                        break
+                else:
+                    return False
+            used = state.row_used + state.column_used + state.subsquare_used
+
+        if not progress:
+            return True
+
+
+def select_cell(state):
+    """Returns the empty cell with the fewest candidates, or None when the grid is full"""
+
+    cells = state.cells
+    candidates = state.candidates
+    best = None
+    best_count = state.geometry.size + 1
+    for idx in range(len(cells)):
+        if cells[idx]:
+            continue
+        count = candidates[idx].bit_count()
+        if count < best_count:
+            best, best_count = idx, count
+            if count <= 2:
+                break
+    return best
+
+
+class SearchSolver:
+    """Depth first search over a CandidateState.
+
+    Each guess is placed on the cell with the fewest candidates and followed
+    by singles propagation.  Dead ends are rolled back through the state's
+    trail instead of copying the grid.  Every node is spent from `budget`,
+    see budget.py.  Puzzles whose givens conflict have no state and no
+    solutions."""
+
+    def __init__(self, puzzle_data, stats=None, budget=None):
+        if isinstance(puzzle_data, CandidateState):
+            self.state = puzzle_data.copy()
+        else:
+            try:
+                self.state = CandidateState(puzzle_data)
+            except ValueError:
+                self.state = None
+
+        self.stats = stats or NULL_STATS
+        self.budget = budget or NULL_BUDGET
+        self.nodes = 0
+        self.guesses = 0
+        self.backtracks = 0
+        self.max_depth = 0
+
+    def solve(self):
+        """Returns the first solution found as SudokuData, None if the
+        puzzle has no solution or BudgetExceeded if the budget ran out"""
+
+        try:
+            found = self.run()
+        except BudgetExceededError as error:
+            return self.budget.exceeded(error, self.stats)
+        if found:
+            return self.state.to_data()
+        return None
+
+    def run(self):
+        """Searches for a solution, leaving it in `self.state`.  Returns
+        whether one was found, raises BudgetExceededError if the budget
+        runs out"""
+
+        if self.state is None:
+            return False
+
+        self.state.mark()
+        try:
+            with self.stats.phase("search"):
+                return self._search(0)
+        finally:
+            self._report()
+
+    def count_solutions(self, limit=2):
+        """Counts the solutions, stopping as soon as `limit` are found so
+        that checking for a unique solution only has to find two.
+        Pass limit=None to count them all.  The first solution found is
+        kept in `self.first_solution`.  Returns BudgetExceeded if the
+        budget runs out first, with the solutions found so far in
+        `self.solutions`"""
+
+        self.solutions = 0
+        self.limit = limit
+        self.first_solution = None
+        if self.state is None:
+            return 0
+
+        mark = self.state.mark()
+        exceeded = None
+        try:
+            with self.stats.phase("count"):
+                self._count(0)
+        except BudgetExceededError as error:
+            exceeded = error
+        self.state.undo(mark)
+        self._report()
+        self.stats.count("solutions", self.solutions)
+
+        if exceeded is not None:
+            return self.budget.exceeded(exceeded, self.stats)
+        return self.solutions
+
+    def iter_solutions(self):
+        """Yields every solution as SudokuData, lazily.
+
+        The search keeps an explicit stack with one [cell, untried values,
+        trail position] entry per guess instead of recursing, so memory does
+        not grow with the number of solutions, and the caller can stop at
+        any point by dropping or closing the generator.  The state is rolled
+        back when it finishes.  If the budget runs out the last item yielded
+        is BudgetExceeded"""
+
+        self.solutions = 0
+        if self.state is None:
+            return
+
+        state = self.state
+        budget = self.budget
+        start = state.mark()
+        trail = state.trail
+        stack = []
+        reported = False
+        try:
+            expand = True
+            while True:
+                if expand:
+                    # Propagate the latest guess, then yield the grid if it
+                    # is full or add a guess on its best cell
+                    self.nodes += 1
+                    budget.spend()
+                    if len(stack) > self.max_depth:
+                        self.max_depth = len(stack)
+
+                    if propagate(state):
+                        idx = select_cell(state)
+                        if idx is None:
+                            self.solutions += 1
+                            yield state.to_data()
+                        else:
+                            stack.append([idx, state.candidates[idx], len(trail)])
+
+                # Move on to the next untried value of the deepest guess,
+                # dropping guesses with none left
+                expand = False
+                while stack:
+                    entry = stack[-1]
+                    idx, untried, mark = entry
+                    if len(trail) > mark:
+                        state.undo(mark)
+                        self.backtracks += 1
+                    if not untried:
+                        stack.pop()
+                        continue
+
+                    mask = untried & -untried
+                    entry[1] = untried ^ mask
+                    self.guesses += 1
+                    if state.place(idx, value_from_bit(mask)):
+                        expand = True
+                        break
+
+                if not expand:
+                    return
+        except BudgetExceededError as error:
+            state.undo(start)
+            self._report()
+            self.stats.count("solutions", self.solutions)
+            reported = True
+            yield budget.exceeded(error, self.stats)
+        finally:
+            state.undo(start)
+            if not reported:
+                self._report()
+                self.stats.count("solutions", self.solutions)
+
+    def _report(self):
+        stats = self.stats
+        stats.count("nodes", self.nodes)
+        stats.count("guesses", self.guesses)
+        stats.count("backtracks", self.backtracks)
+        stats.maximum("max_depth", self.max_depth)
+
+    def _search(self, depth):
+        state = self.state
+        self.nodes += 1
+        self.budget.spend()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+        if not propagate(state):
+            return False
+
+        idx = select_cell(state)
+        if idx is None:
+            return True
+
+        for value in mask_values(state.candidates[idx]):
+            mark = state.mark()
+            self.guesses += 1
+            if state.place(idx, value) and self._search(depth + 1):
+                return True
+            state.undo(mark)
+            self.backtracks += 1
+
+        return False
+
+    def _count(self, depth):
+        # Same search as _search but keeps going after a solution, returns
+        # True once the limit is reached
+        state = self.state
+        self.nodes += 1
+        self.budget.spend()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+        if not propagate(state):
+            return False
+
+        idx = select_cell(state)
+        if idx is None:
+            self.solutions += 1
+            if self.first_solution is None:
+                self.first_solution = state.to_data()
+            return self.solutions == self.limit
+
+        for value in mask_values(state.candidates[idx]):
+            mark = state.mark()
+            self.guesses += 1
+            if state.place(idx, value) and self._count(depth + 1):
+                return True
+            state.undo(mark)
+            self.backtracks += 1
+
+        return False
+
+
+def count_solutions(puzzle_data, limit=2, stats=None, budget=None):
+    """Returns the number of solutions of a puzzle, up to `limit`.
+
+    0 means no solution, including puzzles whose givens conflict, 1 a unique
+    solution and `limit` that there are at least that many.  BudgetExceeded
+    means the budget ran out before the count was settled"""
+
+    return SearchSolver(puzzle_data, stats=stats, budget=budget).count_solutions(limit)
+
+
+def iter_solutions(puzzle_data, stats=None, budget=None):
+    """Returns a generator of every solution of a puzzle, see
+    SearchSolver.iter_solutions.  Puzzles whose givens conflict have none"""
+
+    return SearchSolver(puzzle_data, stats=stats, budget=budget).iter_solutions()
+
+
+def has_unique_solution(puzzle_data):
+    return count_solutions(puzzle_data, limit=2) == 1
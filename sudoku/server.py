@@ -0,0 +1,423 @@
+"""Headless HTTP/JSON server for solving puzzles, built on asyncio.
+
+Endpoints take a JSON object as the POST body and answer with one:
+
+    POST /solve     {"puzzle": ..., "solver": "search"}  ->  {"solution": "..." or null}
+    POST /validate  {"puzzle": ...}                      ->  {"state": "VALID", "ERROR" or "COMPLETE"}
+    POST /count     {"puzzle": ..., "limit": 2}          ->  {"count": n, "unique": true or false}
+    GET  /health                                         ->  {"status": "ok"}
+    GET  /stats                                          ->  request and batch counters
+
+A puzzle is a string in any format accepted by `utils.parse_puzzle` or a
+list of values with null for empty cells.  Solutions are returned in the
+line format.
+
+Solves and counts may also give a "timeout" in seconds and "max_nodes",
+lowering the server's own limits.  A request that runs out is answered
+with a null solution or count and a "budget_exceeded" object holding the
+reason, nodes spent and seconds elapsed.
+
+Validation is cheap and answered on the event loop.  Solves and counts are
+CPU bound, so they are queued and sent to a pool of worker processes in
+micro-batches: every request arriving within `window` seconds of the first
+one queued goes out together, split across the workers, which saves a
+round trip to a worker per request under load.  Connections are kept alive
+between requests unless the client asks otherwise.
+
+    python -m sudoku serve --port 8080
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import signal
+
+from .budget import Budget, BudgetExceeded
+from .data import SudokuData
+from .solver import get_solver
+from .stats import SolverStats
+from .utils import parse_puzzle, format_puzzle
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_SOLVER = "search"
+
+# Seconds a queued job waits for others to share its batch, and the most
+# jobs sent out together
+DEFAULT_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 256
+
+# Largest request body accepted and largest solution count asked for
+MAX_BODY_SIZE = 64 * 1024
+MAX_COUNT_LIMIT = 1000
+
+STATUS_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        Exception.__init__(self, message)
+        self.status = status
+        self.message = message
+
+
+def run_jobs(jobs):
+    """Runs a batch of (endpoint, cells, solver, limit, timeout, max_nodes)
+    jobs in a worker, returning a result dict or a ValueError message for
+    each"""
+    from .search import count_solutions
+
+    results = []
+    for endpoint, cells, solver, limit, timeout, max_nodes in jobs:
+        try:
+            puzzle = SudokuData(cells)
+            budget = Budget(timeout, max_nodes)
+            if endpoint == "solve":
+                answer = get_solver(solver)(puzzle, budget=budget).solve()
+                result = {"solution": format_puzzle(answer, "line") if answer else None}
+            else:
+                answer = count_solutions(puzzle, limit, budget=budget)
+                if isinstance(answer, BudgetExceeded):
+                    result = {"count": None, "unique": None}
+                else:
+                    result = {"count": answer, "unique": answer == 1}
+
+            if isinstance(answer, BudgetExceeded):
+                result["budget_exceeded"] = {
+                    "reason": answer.reason,
+                    "nodes": answer.nodes,
+                    "elapsed": answer.elapsed,
+                }
+            results.append(result)
+        except ValueError as error:
+            results.append(str(error))
+    return results
+
+
+def _resolve(futures, batch):
+    # Hands the results of a finished batch to the requests waiting on it
+    error = batch.exception()
+    for position, future in enumerate(futures):
+        if future.done():
+            continue
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(batch.result()[position])
+
+
+class MicroBatcher:
+    """Queues jobs for `run_jobs` and sends them to an executor in batches.
+
+    The first job queued starts a timer of `window` seconds, when it fires
+    or `max_batch` jobs are queued everything queued is split into up to
+    `workers` batches and submitted.  An executor of None runs the batches
+    in the event loop's default thread pool."""
+
+    def __init__(self, executor, workers=1, window=DEFAULT_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        self.executor = executor
+        self.workers = workers
+        self.window = window
+        self.max_batch = max_batch
+        self.stats = SolverStats()
+        self._jobs = []
+        self._futures = []
+        self._timer = None
+
+    def submit(self, job):
+        """Queues a job, returning a future of its result"""
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._jobs.append(job)
+        self._futures.append(future)
+        if len(self._jobs) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        """Submits every queued job now"""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        jobs, futures = self._jobs, self._futures
+        self._jobs, self._futures = [], []
+        if not jobs:
+            return
+
+        loop = asyncio.get_running_loop()
+        size = -(-len(jobs) // self.workers)
+        for start in range(0, len(jobs), size):
+            batch = loop.run_in_executor(self.executor, run_jobs, jobs[start:start + size])
+            batch.add_done_callback(lambda batch, futures=futures[start:start + size]: _resolve(futures, batch))
+            self.stats.count("batches")
+            self.stats.maximum("max_batch_size", min(size, len(jobs) - start))
+        self.stats.count("batched_jobs", len(jobs))
+
+
+def _parse_cells(payload):
+    # Cells of the puzzle in a request body, as a list with None for empty
+    puzzle = payload.get("puzzle")
+    try:
+        if isinstance(puzzle, str):
+            return list(parse_puzzle(puzzle))
+        if isinstance(puzzle, list):
+            cells = [value or None for value in puzzle]
+            size = SudokuData(cells).size
+            if any(value is not None and (type(value) is not int or not 0 < value <= size) for value in cells):
+                raise ValueError(f"Values must be null or integers from 1 to {size}")
+            return cells
+    except ValueError as error:
+        raise HTTPError(400, f"Invalid puzzle: {error}")
+    raise HTTPError(400, "Expected a puzzle string or list")
+
+
+async def _read_request(reader):
+    """Reads one request, returning (method, path, headers, body) or None
+    if the connection was closed before it started"""
+
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+
+    headers = {"version": version}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length < 0:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(413, f"Body larger than {MAX_BODY_SIZE} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
+
+
+def _keep_alive(headers):
+    connection = headers.get("connection", "").lower()
+    if headers["version"] == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode()
+    writer.write(
+        f"HTTP/1.1 {status} {STATUS_REASONS[status]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"\r\n".encode("latin-1") + body
+    )
+
+
+class SudokuServer:
+    """Serves the endpoints on host and port with a pool of `workers`
+    processes, defaulting to the CPU count, or without one in this
+    process if workers is 0"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, window=DEFAULT_WINDOW, max_batch=DEFAULT_MAX_BATCH, solver=DEFAULT_SOLVER, timeout=None, max_nodes=None):
+        get_solver(solver)
+
+        self.host = host
+        self.port = port
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.window = window
+        self.max_batch = max_batch
+        self.solver = solver
+        self.timeout = timeout  # Limits of every solve and count
+        self.max_nodes = max_nodes
+        self.stats = SolverStats()
+        self.executor = None
+        self.batcher = None
+        self._server = None
+
+        self.routes = {
+            ("POST", "/solve"): self.solve,
+            ("POST", "/validate"): self.validate,
+            ("POST", "/count"): self.count,
+            ("GET", "/health"): self.health,
+            ("GET", "/stats"): self.get_stats,
+        }
+
+    async def start(self):
+        """Starts the worker pool and listens, returning the bound port"""
+
+        if self.workers:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.batcher = MicroBatcher(self.executor, max(self.workers, 1), self.window, self.max_batch)
+
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        try:
+            if self._server is not None:
+                self._server.close()
+                await self._server.wait_closed()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await _read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = _keep_alive(headers)
+                    status, payload = 200, await self.dispatch(method, path, body)
+                except HTTPError as error:
+                    status, payload = error.status, {"error": error.message}
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as error:
+                    # Answer a bug in a handler rather than dropping the
+                    # connection, which is closed as its state is unknown
+                    status, payload = 500, {"error": f"Internal error: {error!r}"}
+                    keep_alive = False
+
+                self.stats.count(f"status_{status}")
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        """Answers a request, returning the response payload or raising HTTPError"""
+
+        path = path.split("?", 1)[0]
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                raise HTTPError(405, f"{method} not allowed on {path}")
+            raise HTTPError(404, f"No endpoint {path}")
+
+        payload = {}
+        if body:
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                raise HTTPError(400, "Body is not valid JSON")
+            if not isinstance(payload, dict):
+                raise HTTPError(400, "Body must be a JSON object")
+
+        self.stats.count(f"requests{path.replace('/', '_')}")
+        return await handler(payload)
+
+    def _limits(self, payload):
+        # The server's limits lowered by any given in the request
+        limits = []
+        for name, default, kind in (("timeout", self.timeout, (int, float)), ("max_nodes", self.max_nodes, int)):
+            value = payload.get(name)
+            if value is None:
+                limits.append(default)
+                continue
+            if not isinstance(value, kind) or isinstance(value, bool) or value <= 0:
+                raise HTTPError(400, f"{name} must be a positive number")
+            limits.append(value if default is None else min(value, default))
+        return tuple(limits)
+
+    async def _run(self, job):
+        try:
+            result = await self.batcher.submit(job)
+        except Exception as error:
+            raise HTTPError(500, f"Worker failed: {error!r}")
+        if isinstance(result, str):
+            raise HTTPError(400, result)
+        return result
+
+    async def solve(self, payload):
+        solver = payload.get("solver", self.solver)
+        if not isinstance(solver, str):
+            raise HTTPError(400, "solver must be a string")
+        try:
+            get_solver(solver)
+        except (ValueError, ImportError) as error:
+            raise HTTPError(400, str(error))
+        return await self._run(("solve", _parse_cells(payload), solver, None) + self._limits(payload))
+
+    async def validate(self, payload):
+        return {"state": SudokuData(_parse_cells(payload)).check().name}
+
+    async def count(self, payload):
+        limit = payload.get("limit", 2)
+        if not isinstance(limit, int) or isinstance(limit, bool) or not 0 < limit <= MAX_COUNT_LIMIT:
+            raise HTTPError(400, f"limit must be an integer from 1 to {MAX_COUNT_LIMIT}")
+        return await self._run(("count", _parse_cells(payload), None, limit) + self._limits(payload))
+
+    async def health(self, payload):
+        return {"status": "ok"}
+
+    async def get_stats(self, payload):
+        stats = SolverStats()
+        stats.merge(self.stats)
+        if self.batcher is not None:
+            stats.merge(self.batcher.stats)
+        return stats.as_dict()
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **kwargs):
+    """Runs a SudokuServer until interrupted or terminated, shutting down
+    its worker pool on the way out"""
+
+    async def run():
+        server = SudokuServer(host, port, **kwargs)
+        try:
+            await server.start()
+            print(f"Serving on http://{server.host}:{server.port}", flush=True)
+
+            serving = asyncio.ensure_future(server.serve_forever())
+            loop = asyncio.get_running_loop()
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(signum, serving.cancel)
+                except NotImplementedError:
+                    # Windows has no signal handlers in the event loop
+                    pass
+            try:
+                await serving
+            except asyncio.CancelledError:
+                pass
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -1,21 +1,25 @@
-from .data import SudokoSuperRow, SudokuData, DataState
-from itertools import permutations, product, accumulate
-from collections import defaultdict
+from .budget import NULL_BUDGET, BudgetExceededError
+from .data import SudokuData, DataState
+from .candidates import CandidateState, all_candidates
+from .search import SearchSolver
+from .stats import NULL_STATS
+from functools import reduce
+from itertools import product
+from operator import or_
 
-from types import Dict, Set
-from progress.bar import Bar
-import time
-
-import enum
+import importlib
 
 class SudokuSolver:
-    def __init__(self, puzzle_data):
+    def __init__(self, puzzle_data, stats=None, store=None, budget=None):
         if isinstance(puzzle_data, SudokuData):
             self._puzzle_data = puzzle_data
         else:
             self._puzzle_data = SudokuData(puzzle_data)
+        self.stats = stats or NULL_STATS
+        self.store = store  # Optional store.SolutionStore read through by solve
+        self.budget = budget or NULL_BUDGET  # Spent once per pass, search node and brute force iteration
         self.iter = 0
-        self.possible_values = defaultdict(list)
+        self.technique_counts = {}
         self.solution = self._puzzle_data.copy()
 
         self.pass_over_puzzle()  # Generate possible values
@@ -24,36 +28,32 @@ class SudokuSolver:
     def puzzle_data(self):
         return self._puzzle_data
 
-    def pass_over_puzzle(self):
-        
-        for idx in self._puzzle_data.puzzle_idxs:
-            if idx in self.solution:
-                continue
-
-            possible_values = SudokuData.ALL_NUMBERS.copy()
-
-            row_values = set(self.puzzle_data.iter_row_from_idx(idx))
-            col_values = set(self.puzzle_data.iter_column_from_idx(idx))
-            subsquare_values = set(self.puzzle_data.iter_subsquare_from_idx(idx))
+    @property
+    def possible_values(self):
+        """Mapping of each empty cell index to its set of possible values,
+        empty if the givens conflict"""
+        if self.candidates is None:
+            return {}
+        return dict(
+            (idx, set(self.candidates.values(idx)))
+            for idx in self.candidates.empty_idxs()
+        )
 
-            possible_values = SudokuData.ALL_NUMBERS.copy()
-            possible_values.difference_update(row_values)
-            possible_values.difference_update(col_values)
-            possible_values.difference_update(subsquare_values) 
-            
-            self.possible_values[idx] = possible_values
+    def pass_over_puzzle(self):
+        try:
+            self.candidates = CandidateState(self.solution)
+        except ValueError:
+            # Conflicting givens, every entry point below answers as for a
+            # puzzle without a solution
+            self.candidates = None
 
     def iter_single_possibles(self):
         """Filters the possible values to the ones with a single possibiity.
         Returns an iterator mapping of (idx, value) values"""
 
-        return map(
-            lambda els: (els[0], tuple(els[1])[0]), 
-            filter(
-                lambda items: len(items[1])==1, 
-                self.possible_values.items()
-            )
-        )
+        if self.candidates is None:
+            return iter(())
+        return self.candidates.iter_singles()
     
     def iter_possble_values(self, row=None, column=None, sub_square=None):
         """Returns the possible values for a row, column, or subsquare"""
@@ -71,292 +71,399 @@ class SudokuSolver:
                 yield el
         
     def iter_possible_row(self, row):
-        for idx in self.puzzle_data.row_indices(row):
-            if idx in self.possible_values:
-                yield (idx, self.possible_values[idx])
+        if self.candidates is None:
+            return
+        for idx in self.candidates.geometry.row_idxs[row]:
+            if self.candidates.is_empty(idx):
+                yield (idx, set(self.candidates.values(idx)))
     
     def iter_possible_column(self, column):
-        for idx in self.puzzle_data.column_indices(column):
-            if idx in self.possible_values:
-                yield (idx, self.possible_values[idx])
+        if self.candidates is None:
+            return
+        for idx in self.candidates.geometry.column_idxs[column]:
+            if self.candidates.is_empty(idx):
+                yield (idx, set(self.candidates.values(idx)))
 
     def iter_possible_subsquare(self, subsquare, ignore_row=None, ignore_column=None):
+        if self.candidates is None:
+            return
+        geometry = self.candidates.geometry
+        sub_square_idxs = geometry.subsquare_idxs[subsquare]
         ignore_idxs = []
         if ignore_row is not None:
-            if SudokuData.is_row_in_subsquare(ignore_row, subsquare):
-                ignore_idxs.extend(SudokuData.row_indices(ignore_row))
+            ignore_idxs.extend(idx for idx in geometry.row_idxs[ignore_row] if idx in sub_square_idxs)
         
         if ignore_column is not None:
-            if SudokuData.is_column_in_subsquare(ignore_column, subsquare):
-                ignore_idxs.extend(SudokuData.column_indices(ignore_column))
+            ignore_idxs.extend(idx for idx in geometry.column_idxs[ignore_column] if idx in sub_square_idxs)
         
-        for idx in self.puzzle_data.subsquare_indices(subsquare):
-            if idx in self.possible_values:
+        for idx in sub_square_idxs:
+            if self.candidates.is_empty(idx):
                 if idx not in ignore_idxs:
-                    yield (idx, self.possible_values[idx])
+                    yield (idx, set(self.candidates.values(idx)))
     
-    def filter_iter_by_single_values(self, idx_iterator):
-        # This monstrosity gets all possibles for an index iterator,
-        # For each of these filter the possibles by values
-        # Finally, filter the ones where there is only 1 result
-        
-        def possible_cells_for_value(possibles, value):
-            return filter(lambda x: x[1] and value in x[1], possibles)
-        
-        possibles = [(idx, self.possible_values.get(idx)) for idx in idx_iterator]
-        # [(idx: int, values: <{value:int,}|None>),]
-
-        possibles_by_value = map(lambda value: (value, tuple(possible_cells_for_value(possibles, value))), SudokuData.ALL_NUMBERS)
-        
-        single_possibles_by_value = map(lambda el: (el[1][0][0], el[0]), filter(lambda x: len(x[1]) ==1, possibles_by_value))
-
-        # [(idx: int, values: {value: int})]
-
-        for idx, val in single_possibles_by_value:
-            yield idx, val
-
-
-        # [(idx, val), ]
-
     def iter_single_value_possibles(self):
+        """Yields (idx, value) for values that only fit in one cell of a
+        column, row or subsquare"""
 
-        def do_the_thing(iterator):
-            return map(lambda i: tuple(self.filter_iter_by_single_values(iterator(i))), range(9))
-
-        for el in do_the_thing(SudokuData.column_indices):
-            if el:
-                yield el[0]
-        
-        for el in do_the_thing(SudokuData.row_indices):
-            if el:
-                yield el[0]
-        
-        for el in do_the_thing(SudokuData.subsquare_indices):
-            if el:
-                yield el[0]
-        
-
+        if self.candidates is None:
+            return iter(())
+        return self.candidates.iter_hidden_singles(self.candidates.geometry.units)
 
     def remove_from_possibles(self, idx, value):
-        try:
-            self.possible_values[idx].remove(value)        
-        except (KeyError, ValueError):
-            pass
+        if self.candidates is not None:
+            self.candidates.eliminate(idx, value)
 
     def update_solution(self, idx, value):
         self.solution.set(idx, value)
-        
-        del self.possible_values[idx]
+        if self.candidates is not None:
+            self.candidates.place(idx, value)
 
-        for row_idx in SudokuData.row_indices(SudokuData.row_from_idx(idx)):
-            self.remove_from_possibles(row_idx, value)
+    def solve_by_passes(self):
+        """Applies the techniques until the puzzle is solved or they stall.
+        Returns the solution, or None if it is not solved or the givens
+        conflict"""
 
-        for column_idx in SudokuData.column_indices(SudokuData.column_from_idx(idx)):
-            self.remove_from_possibles(column_idx, value)
+        if self.candidates is None:
+            return None
+        try:
+            with self.stats.phase("passes"):
+                return self._solve_by_passes()
+        finally:
+            self.stats.count("passes", self.iter)
 
-        for subsquare_idx in SudokuData.subsquare_indices(SudokuData.subsquare_from_idx(idx)):
-            self.remove_from_possibles(subsquare_idx, value)
+    def _solve_by_passes(self):
+        from .techniques import ELIMINATION_TECHNIQUES, apply_first
 
-    def solve_by_passes(self):
-        print("Solving Via Iterated Passes")
+        candidates = self.candidates
+        candidates.watch()
+        all_units = candidates.geometry.units
+        naked_singles = hidden_singles = 0
 
-        while not self.solution.is_puzzle_solved():
+        while not candidates.is_solved():
             self.iter += 1
-            solution_copy = self.solution.copy()
-            # print(f"Iter: {self.iter}")
-            # self.solution.print()
-            
-            # Check for any cells with only 1 possibility
-            # Update and iterate until no more exist
-            single_possibilities = tuple(self.iter_single_possibles())
-            while single_possibilities:
-                for (idx, val) in single_possibilities:
+            self.budget.spend()
+            changes = candidates.changes
+
+            # Place the cells queued with a single possibility, placing
+            # them may queue more
+            pending_cells = candidates.pending_cells
+            while pending_cells:
+                idx = pending_cells.pop()
+                if candidates.is_empty(idx) and candidates.count(idx) == 1:
+                    self.update_solution(idx, candidates.values(idx)[0])
+                    naked_singles += 1
+
+            # Check the units that changed for any values that have to be
+            # in a cell due to row/column/subsquare restrictions
+            units = [all_units[unit] for unit in sorted(candidates.pending_units)]
+            candidates.pending_units.clear()
+            for (idx, val) in tuple(candidates.iter_hidden_singles(units)):
+                if candidates.is_empty(idx) and val in candidates.values(idx):
                     self.update_solution(idx, val)
-                single_possibilities = tuple(self.iter_single_possibles())
-            
-            
-            # Check for any values that have to be in a cell due to row/column/subsquare restrictions
-            for (idx, val) in self.iter_single_value_possibles():
-                self.update_solution(idx, val)
-       
-            if self.solution == solution_copy:
-                print(f"No new free spaces found after {self.iter} passes")
-                # self.solution.print()
-                return
+                    hidden_singles += 1
+
+            if candidates.changes == changes:
+                # Only fall back to the more expensive techniques once
+                # singles stall, and go back to singles after any progress
+                if apply_first(candidates, ELIMINATION_TECHNIQUES, self.technique_counts):
+                    continue
+                break
 
-        print(f"Solution found after {self.iter} iterations")
-        return self.solution
+        for name, count in (("naked_single", naked_singles), ("hidden_single", hidden_singles)):
+            if count:
+                self.technique_counts[name] = self.technique_counts.get(name, 0) + count
 
-    def brute_force_possible_values(self):
-        possible_lengths = map(lambda s: len(s), filter(lambda els: els, self.possible_values.values()))
-        max_iterations = tuple(accumulate(possible_lengths, func=int.__mul__, initial=1))[-1]
-        print(f"Max Brute Force Iterations: {max_iterations}")
+        if candidates.is_solved():
+            return self.solution
 
+    def brute_force_possible_values(self):
         possible_idx_values = filter(lambda els: els[1], self.possible_values.items())
         possibles = tuple(map(lambda items: tuple(map(lambda v: (items[0], v) ,items[1])), possible_idx_values))
 
         iter = 0
-        next_iter_report = max_iterations // 1000
-        current_iter_report = 0
-
-        bar = Bar("Brute Force", max = 1000)
-
-        start_time = time.time()
-        for possible_row in product(*possibles):
-            if iter  == current_iter_report: 
-                bar.next()
-                current_iter_report += next_iter_report
-            iter += 1
-            solution = self.solution.copy()
-            for idx, val in possible_row:
-                solution.set(idx, val)
-            
-            if solution.is_puzzle_solved():
-                break
-        
-        time_elapsed = time.time() - start_time
-        if not solution.is_puzzle_solved():
-            print(f"No solution found after {iter} iterations and {time_elapsed} seconds")
+        solution = None
+        try:
+            with self.stats.phase("brute_force"):
+                for possible_row in product(*possibles):
+                    iter += 1
+                    self.budget.spend()
+                    solution = self.solution.copy()
+                    for idx, val in possible_row:
+                        solution.set(idx, val)
 
-        else:
-            print(f"Solution Found after {iter} iterations and {time_elapsed} seconds")
-            solution.print()
+                    if solution.is_puzzle_solved():
+                        break
+        except BudgetExceededError as error:
+            self.stats.count("brute_force_iterations", iter)
+            return self.budget.exceeded(error, self.stats)
+        self.stats.count("brute_force_iterations", iter)
+
+        if solution is not None and solution.is_puzzle_solved():
             return solution
 
     def solve(self):
-        print("Solving Sudoku puzzle")
-        self.puzzle_data.print()
-
         match self.puzzle_data.check():
             case DataState.ERROR:
-                raise ValueError("Input puzzle has an error")
+                return None
             case DataState.COMPLETE:
-                print("Puzzle is already complete")
                 return self.puzzle_data
-       
+
+        if self.store is not None:
+            return self.store.read_through(self.puzzle_data, self._solve_within_budget, self.stats)
+        return self._solve_within_budget()
+
+    def _solve_within_budget(self):
+        try:
+            return self._solve()
+        except BudgetExceededError as error:
+            self._report_techniques()
+            return self.budget.exceeded(error, self.stats)
+
+    def _solve(self):
         solution = self.solve_by_passes()
 
         if not solution:
-            # Brute force remaining
-            print("Attempting brute force solver")
-
-            def iter_puzzle(puzzle):
-                pass
-            
-            idx, shortest_vals = self._get_shortest_possibles()
-
-            for val in shortest_vals:
-                solver = SudokuSolver(self.solution)
-                solver.update_solution(idx, val)
-                try:
-                    solution = solver.solve()
-                except ValueError:
-                    continue
-                else:
-                    pass
-                
-            # solution = self.brute_force_possible_values()
-            
+            # Search the remaining candidates
+            search = SearchSolver(self.candidates, stats=self.stats, budget=self.budget)
+            if not search.run():
+                self._report_techniques()
+                return None
+
+            for idx, value in enumerate(search.state.cells):
+                if self.candidates.is_empty(idx):
+                    self.update_solution(idx, value)
+            solution = self.solution
+
+        self._report_techniques()
+        self.stats.count("placements", len(self.puzzle_data.puzzle_idxs))
         return solution
 
+    def iter_solutions(self):
+        """Yields every solution as SudokuData, lazily.  The passes run
+        first, their deductions hold for every solution, then the search
+        enumerates the rest, see SearchSolver.iter_solutions"""
 
-class BruteForceSolver(SudokuSolver):
+        if self.candidates is None:
+            return
 
-    def solve(self):
-        print("Solving by Brute Force")
-        return self.solve_by_brute_force()
+        try:
+            solution = self.solve_by_passes()
+        except BudgetExceededError as error:
+            self._report_techniques()
+            yield self.budget.exceeded(error, self.stats)
+            return
+        self._report_techniques()
+
+        if solution:
+            yield solution.copy()
+        else:
+            yield from SearchSolver(self.candidates, stats=self.stats, budget=self.budget).iter_solutions()
 
-    def solve_by_brute_force(self):
-        
-        # lets try brute force
-
-        # Can we solve by super rows first?  3 subsquares in a row?
-        counter = [ 0 ] * 3
-        for super_row_3 in self.iter_valid_super_row(2):
-            counter[0] += 1
-            for super_row_2 in self.iter_valid_super_row(1):
-                counter[1] +=1
-                for super_row_1 in self.iter_valid_super_row(0):
-                    counter[2] += 1
-                    solution = SudokuData(super_row_1.data + super_row_2.data + super_row_3.data)
-                    self.iter += 1
-                    if solution.is_puzzle_solved():
-                        return solution
-        
-        return None
+    def _report_techniques(self):
+        for name, count in self.technique_counts.items():
+            self.stats.technique(name, count)
 
-    def iter_valid_super_row(self, super_row):
-        if super_row < 0 or super_row >= 3:
-            raise ValueError(f"Super Row index out bounds {super_row}")
-        start = 3 * super_row
-        iter_count = 0
 
-        initials = []
-        for i in range(3):
-            row_initials = []
+class BruteForceSolver:
+    """Tries whole rows at a time.
 
-            for idx, el in enumerate(self._puzzle_data.row(start + i)):
-                if el is not None:
-                    row_initials.append((idx, el))
+    Every way of filling each row that agrees with the givens of the row
+    and of the columns and subsquares it crosses is listed up front, as an
+    integer code with bit size * column + value - 1 set for each cell and
+    the same for its subsquare above those, so a row clashes with the rows
+    already placed exactly when their codes share a bit.  After each row is
+    placed the remaining rows are filtered against it and the row with the
+    fewest fits left is placed next.  Each row tried is spent from the
+    budget, as is each row listed.
 
-            initials.append(row_initials)
+    The rows are listed from the givens alone, without the CandidateState
+    the passes and search share, so this is an independent cross-check of
+    them, and shares no code with SudokuSolver.  Conflicting givens leave
+    some row or value without a fit, so the puzzle has no solution."""
 
+    def __init__(self, puzzle_data, stats=None, store=None, budget=None):
+        if isinstance(puzzle_data, SudokuData):
+            self._puzzle_data = puzzle_data
+        else:
+            self._puzzle_data = SudokuData(puzzle_data)
+        self.stats = stats or NULL_STATS
+        self.store = store  # Optional store.SolutionStore read through by solve
+        self.budget = budget or NULL_BUDGET  # Spent once per row listed and row tried
+        self.iter = 0
 
-        for row1 in self.permute_allowed_rows(initials[0]):
-            for row2 in self.permute_allowed_rows(initials[1], previous_row=row1):
-                for row3 in self.permute_allowed_rows(initials[2]):
-                    superrow = SudokoSuperRow(row1 + row2 + row3)
-                    iter_count += 1
-                    if superrow.is_valid(): 
-                        yield superrow
+    @property
+    def puzzle_data(self):
+        return self._puzzle_data
 
-    def check_stub(self, data):
-        # 2 row stub
-        for i in range(9):
-            if data[i] == data [i + 9]:
-                return False
-        
-        for i in range(3):
-            if len(set(data[3*i : 3*(i+1)] + data[9+3*i : 12 + 3*i]))!=6:
+    def solve(self):
+        """Returns a solution as SudokuData, None if the puzzle has no
+        solution or BudgetExceeded if the budget ran out"""
+
+        if self.store is not None:
+            return self.store.read_through(self.puzzle_data, self._solve_within_budget, self.stats)
+        return self._solve_within_budget()
+
+    def _solve_within_budget(self):
+        try:
+            with self.stats.phase("brute_force"):
+                return self.solve_by_brute_force()
+        except BudgetExceededError as error:
+            self.stats.count("brute_force_iterations", self.iter)
+            return self.budget.exceeded(error, self.stats)
+
+    def count_solutions(self, limit=2):
+        """Counts the solutions up to `limit`, or all with limit=None, as
+        search.SearchSolver.count_solutions does.  Returns BudgetExceeded
+        if the budget runs out first"""
+
+        try:
+            with self.stats.phase("brute_force"):
+                count = self._place_all(limit)
+        except BudgetExceededError as error:
+            self.stats.count("brute_force_iterations", self.iter)
+            return self.budget.exceeded(error, self.stats)
+        self.stats.count("brute_force_iterations", self.iter)
+        self.stats.count("solutions", count)
+        return count
+
+    def solve_by_brute_force(self):
+        self._place_all(1)
+        self.stats.count("brute_force_iterations", self.iter)
+        if self.first_solution is None:
+            return None
+
+        geometry = self._puzzle_data.geometry
+        size = geometry.size
+        values = all_candidates(size)
+        data = []
+        for row in range(size):
+            code = self.first_solution[row]
+            for column in range(size):
+                data.append(((code >> size * column) & values).bit_length())
+        return SudokuData(data, geometry.box_size)
+
+    def _place_all(self, limit):
+        # Places rows until `limit` solutions are found, or all of them with
+        # limit=None, keeping the row codes of the first in first_solution
+        geometry = self._puzzle_data.geometry
+        rows = [(row, self.candidate_rows(row)) for row in range(geometry.size)]
+        self._all_codes = (1 << 2 * geometry.n_cells) - 1
+        self.solutions = 0
+        self.limit = limit
+        self.first_solution = None
+        self._place_rows(rows, 0, {})
+        return self.solutions
+
+    def candidate_rows(self, row):
+        """Returns the codes of every way of filling a row that agrees with
+        the givens of the row and of the columns and subsquares it crosses"""
+
+        geometry = self._puzzle_data.geometry
+        size = geometry.size
+        data = self._puzzle_data.data
+        all_values = all_candidates(size)
+
+        def givens(idxs):
+            mask = 0
+            for idx in idxs:
+                if data[idx] is not None:
+                    mask |= 1 << (data[idx] - 1)
+            return mask
+
+        row_givens = givens(geometry.row_idxs[row])
+        cells = []
+        for column, idx in enumerate(geometry.row_idxs[row]):
+            subsquare = geometry.cell_subsquare[idx]
+            if data[idx] is not None:
+                allowed = 1 << (data[idx] - 1)
+            else:
+                allowed = all_values & ~(
+                    row_givens
+                    | givens(geometry.column_idxs[column])
+                    | givens(geometry.subsquare_idxs[subsquare])
+                )
+            cells.append((allowed, size * column, size * (size + subsquare)))
+
+        # Cells with the fewest values allowed first, so dead ends are met early
+        cells.sort(key=lambda cell: cell[0].bit_count())
+        codes = []
+        budget = self.budget
+
+        def fill(position, used, code):
+            if position == size:
+                budget.spend()
+                codes.append(code)
+                return
+            allowed, column_shift, subsquare_shift = cells[position]
+            allowed &= ~used
+            while allowed:
+                mask = allowed & -allowed
+                allowed ^= mask
+                fill(position + 1, used | mask, code | mask << column_shift | mask << subsquare_shift)
+
+        fill(0, 0, 0)
+        return codes
+
+    def _place_rows(self, rows, used, placed):
+        # rows holds (row, codes) for each row not placed yet, returns True
+        # once the limit of solutions is reached
+        if not rows:
+            self.solutions += 1
+            if self.first_solution is None:
+                self.first_solution = dict(placed)
+            return self.solutions == self.limit
+
+        # Drop the codes clashing with the rows placed so far, giving up as
+        # soon as a row has none left or a value can no longer be placed in
+        # some column or subsquare
+        remaining = []
+        covered = used
+        for row, codes in rows:
+            fits = [code for code in codes if not code & used]
+            if not fits:
                 return False
-        
-        return True
-
-    def permute_allowed_rows(self, initials, previous_row=None):
-        previous_row = previous_row or []
-        initial_positions, initial_values = list(zip(*initials))
-        numbers_to_permute = SudokuData.ALL_NUMBERS.difference(set(initial_values))
-
-        for permutation in permutations(numbers_to_permute):
-            row = list(permutation)
-            [row.insert(idx, val) for idx, val in initials]
-            
-            if previous_row:
-                if not self.check_stub(previous_row + row): 
-                    continue
-            yield row
+            covered |= reduce(or_, fits)
+            remaining.append((len(fits), row, fits))
+        if covered != self._all_codes:
+            return False
+        remaining.sort(key=lambda entry: entry[:2])
+        _, row, fits = remaining[0]
+        rest = [(other, codes) for _, other, codes in remaining[1:]]
+
+        for code in fits:
+            self.iter += 1
+            self.budget.spend()
+            placed[row] = code
+            if self._place_rows(rest, used | code, placed):
+                return True
+        return False
 
-    def brute_force_possible_values(self):
-        max_iterations = list(accumulate(map(lambda s: len(s), self.possible_values.values()), func=int.__mul__, initial=1))[-1]
-        print(f"Max Brute Force Iterations: {max_iterations}")
 
-        
-        possibles = tuple(map(lambda items: tuple(zip(*items)), self.possible_values.items()))
+# Solvers selectable by name
+SOLVERS = {
+    "passes": SudokuSolver,
+    "brute-force": BruteForceSolver,
+    "search": SearchSolver,
+}
 
-        iter = 0
-        for possible_row in product(*possibles):
-            iter += 1
-            solution = self.solution.copy()
-            for idx, val in possible_row:
-                solution.set(idx, val)
-            
-            if solution.is_puzzle_solved():
-                break
-        
-        if not solution.is_puzzle_solved():
-            print(f"No solution found after {iter} iterations")
-        
-        else:
-            print(f"Solution Found after {iter} iterations")
-            solution.print()
-            return solution
+# Solvers only imported by get_solver, as (module, class name), so that
+# importing sudoku.solver stays cheap and needs no optional dependencies
+LAZY_SOLVERS = {
+    "dlx": ("sudoku.dlx", "DLXSolver"),
+    "numba": ("sudoku.backends.numba", "NumbaSolver"),
+}
+
+SOLVER_NAMES = tuple(SOLVERS) + tuple(LAZY_SOLVERS)
+
+
+def get_solver(name):
+    """Returns the solver class registered under name"""
+
+    if name in SOLVERS:
+        return SOLVERS[name]
+
+    if name in LAZY_SOLVERS:
+        module, class_name = LAZY_SOLVERS[name]
+        return getattr(importlib.import_module(module), class_name)
+
+    raise ValueError(f"Unknown solver {name}")
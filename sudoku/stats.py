@@ -0,0 +1,98 @@
+"""Solver statistics.
+
+Solvers take an optional `stats` object and report to it at coarse points,
+once per phase or per solve, never per candidate elimination.  The default
+NULL_STATS ignores everything; pass a SolverStats to collect counters,
+per technique changes, maxima and wall time per phase, and export them
+with `as_dict` or `to_json`.  Stats from many solves can be combined with
+`merge`.
+"""
+from contextlib import contextmanager, nullcontext
+import time
+
+
+class NullStats:
+    """Stats sink that records nothing"""
+
+    enabled = False
+
+    def count(self, name, amount=1):
+        pass
+
+    def technique(self, name, amount=1):
+        pass
+
+    def maximum(self, name, value):
+        pass
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def as_dict(self):
+        return {}
+
+
+_NULL_PHASE = nullcontext()
+NULL_STATS = NullStats()
+
+
+class SolverStats(NullStats):
+    """Collects counters (placements, guesses, backtracks, ...), changes
+    made per technique, maxima such as the search depth and wall time per
+    phase in seconds"""
+
+    enabled = True
+
+    def __init__(self):
+        self.counters = {}
+        self.techniques = {}
+        self.maxima = {}
+        self.phases = {}
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def technique(self, name, amount=1):
+        self.techniques[name] = self.techniques.get(name, 0) + amount
+
+    def maximum(self, name, value):
+        if value > self.maxima.get(name, value - 1):
+            self.maxima[name] = value
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def as_dict(self):
+        return {
+            "counters": dict(self.counters),
+            "techniques": dict(self.techniques),
+            "maxima": dict(self.maxima),
+            "phases": dict(self.phases),
+        }
+
+    def to_json(self, **kwargs):
+        import json
+
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def merge(self, other):
+        """Adds the counts and times of another SolverStats or its as_dict
+        output to this one, keeping the larger of each maximum"""
+
+        if isinstance(other, SolverStats):
+            other = other.as_dict()
+
+        for name, amount in other.get("counters", {}).items():
+            self.count(name, amount)
+        for name, amount in other.get("techniques", {}).items():
+            self.technique(name, amount)
+        for name, value in other.get("maxima", {}).items():
+            self.maximum(name, value)
+        for name, seconds in other.get("phases", {}).items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+        return self
@@ -0,0 +1,102 @@
+"""Persistent solution store in a SQLite database.
+
+Solutions are keyed by the puzzle in the 81 character line format, so they
+survive restarts and can be shared by several processes, each opening its
+own SolutionStore on the same file.  The database is in WAL mode, which
+lets any number of readers run alongside a writer.  Writes are buffered
+and committed `batch_size` at a time, or on `flush` and `close`.
+"""
+import sqlite3
+
+from .stats import NULL_STATS
+from .utils import parse_puzzle, format_puzzle
+
+DEFAULT_BATCH_SIZE = 500
+
+# Seconds to wait for another process's write to finish
+DEFAULT_TIMEOUT = 30.0
+
+
+class SolutionStore:
+    """Solutions of puzzles kept in the SQLite database at path"""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE, timeout=DEFAULT_TIMEOUT):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+
+        self._connection = sqlite3.connect(path, timeout=timeout)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS solutions "
+                "(puzzle TEXT PRIMARY KEY, solution TEXT NOT NULL) WITHOUT ROWID"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        self.flush()
+        return self._connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def get(self, puzzle_data):
+        """Returns the stored solution of a puzzle as SudokuData, or None"""
+
+        key = format_puzzle(puzzle_data, "line")
+        solution = self._pending.get(key)
+        if solution is None:
+            row = self._connection.execute(
+                "SELECT solution FROM solutions WHERE puzzle = ?", (key, )
+            ).fetchone()
+            solution = row and row[0]
+
+        if solution is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return parse_puzzle(solution)
+
+    def read_through(self, puzzle_data, solve, stats=NULL_STATS):
+        """Returns the stored solution of a puzzle, counted as a
+        "store_hits" in stats, or else the result of calling solve(),
+        queueing it to be written if it is a solution"""
+
+        solution = self.get(puzzle_data)
+        if solution is not None:
+            stats.count("store_hits")
+            return solution
+
+        solution = solve()
+        if solution:
+            self.put(puzzle_data, solution)
+        return solution
+
+    def put(self, puzzle_data, solution):
+        """Queues the solution of a puzzle to be written with the next batch"""
+
+        self._pending[format_puzzle(puzzle_data, "line")] = format_puzzle(solution, "line")
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the queued solutions in one transaction"""
+
+        if not self._pending:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO solutions (puzzle, solution) VALUES (?, ?)",
+                self._pending.items()
+            )
+        self._pending.clear()
+
+    def close(self):
+        self.flush()
+        self._connection.close()
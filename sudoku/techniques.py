@@ -0,0 +1,239 @@
+"""Logical solving techniques over a CandidateState.
+
+Each technique takes a state, applies every deduction it finds and returns
+the number of placements or eliminations it made.  TECHNIQUES lists them
+from cheapest to most expensive; `apply_techniques` always goes back to
+the cheapest technique after any progress, so the expensive ones only run
+when everything before them has stalled.
+"""
+from itertools import combinations
+
+from .candidates import mask_values, bit
+
+
+def _eliminate_mask(state, idx, mask):
+    """Removes all values in mask from a cell, returning the number removed"""
+
+    removed = 0
+    for value in mask_values(state.candidates[idx] & mask):
+        state.eliminate(idx, value)
+        removed += 1
+    return removed
+
+
+def naked_singles(state):
+    placed = 0
+    for idx, value in tuple(state.iter_singles()):
+        if state.candidates[idx] == bit(value):
+            state.place(idx, value)
+            placed += 1
+    return placed
+
+
+def hidden_singles(state):
+    placed = 0
+    for idx, value in tuple(state.iter_hidden_singles(state.geometry.units)):
+        if state.candidates[idx] & bit(value):
+            state.place(idx, value)
+            placed += 1
+    return placed
+
+
+def locked_candidates(state):
+    """Pointing: a value confined to one row or column within a subsquare is
+    removed from the rest of that row or column.  Claiming: a value confined
+    to one subsquare within a row or column is removed from the rest of that
+    subsquare."""
+
+    geometry = state.geometry
+    candidates = state.candidates
+    values = range(1, geometry.size + 1)
+    removed = 0
+
+    for sub_square in geometry.subsquare_idxs:
+        for value in values:
+            mask = bit(value)
+            idxs = [idx for idx in sub_square if candidates[idx] & mask]
+            if len(idxs) < 2:
+                continue
+            for cell_line, lines in ((geometry.cell_row, geometry.row_idxs), (geometry.cell_column, geometry.column_idxs)):
+                line = cell_line[idxs[0]]
+                if all(cell_line[idx] == line for idx in idxs):
+                    for idx in lines[line]:
+                        if idx not in sub_square:
+                            removed += _eliminate_mask(state, idx, mask)
+
+    cell_subsquare = geometry.cell_subsquare
+    for lines in (geometry.row_idxs, geometry.column_idxs):
+        for line in lines:
+            for value in values:
+                mask = bit(value)
+                idxs = [idx for idx in line if candidates[idx] & mask]
+                if len(idxs) < 2:
+                    continue
+                sub_square = cell_subsquare[idxs[0]]
+                if all(cell_subsquare[idx] == sub_square for idx in idxs):
+                    for idx in geometry.subsquare_idxs[sub_square]:
+                        if idx not in line:
+                            removed += _eliminate_mask(state, idx, mask)
+
+    return removed
+
+
+def _naked_subsets(state, size):
+    """N cells of a unit that together hold only N values remove those values
+    from the rest of the unit"""
+
+    candidates = state.candidates
+    removed = 0
+    for unit in state.geometry.units:
+        idxs = [idx for idx in unit if 2 <= candidates[idx].bit_count() <= size]
+        for subset in combinations(idxs, size):
+            union = 0
+            for idx in subset:
+                union |= candidates[idx]
+            if union.bit_count() != size:
+                continue
+            for idx in unit:
+                if idx not in subset:
+                    removed += _eliminate_mask(state, idx, union)
+    return removed
+
+
+def _hidden_subsets(state, size):
+    """N values of a unit that can only go in the same N cells remove all
+    other values from those cells"""
+
+    candidates = state.candidates
+    removed = 0
+    for unit in state.geometry.units:
+        # Positions of each value within the unit as a bit mask
+        positions = {}
+        for value in range(1, len(unit) + 1):
+            mask = bit(value)
+            value_positions = 0
+            for position, idx in enumerate(unit):
+                if candidates[idx] & mask:
+                    value_positions |= 1 << position
+            if 2 <= value_positions.bit_count() <= size:
+                positions[value] = value_positions
+
+        for values in combinations(positions, size):
+            union = 0
+            for value in values:
+                union |= positions[value]
+            if union.bit_count() != size:
+                continue
+            keep = 0
+            for value in values:
+                keep |= bit(value)
+            for position in mask_values(union):
+                idx = unit[position - 1]
+                removed += _eliminate_mask(state, idx, ~keep)
+    return removed
+
+
+def _fish(state, size):
+    """A value confined to the same N columns in N rows is removed from those
+    columns in every other row, and the same with rows and columns swapped.
+    Size 2 is an X-Wing, size 3 a Swordfish."""
+
+    geometry = state.geometry
+    candidates = state.candidates
+    removed = 0
+    for base_lines, cover_lines in ((geometry.row_idxs, geometry.column_idxs), (geometry.column_idxs, geometry.row_idxs)):
+        for value in range(1, geometry.size + 1):
+            mask = bit(value)
+
+            # Positions of the value within each base line as a bit mask
+            positions = {}
+            for line, idxs in enumerate(base_lines):
+                line_positions = 0
+                for position, idx in enumerate(idxs):
+                    if candidates[idx] & mask:
+                        line_positions |= 1 << position
+                if 2 <= line_positions.bit_count() <= size:
+                    positions[line] = line_positions
+
+            for lines in combinations(positions, size):
+                union = 0
+                for line in lines:
+                    union |= positions[line]
+                if union.bit_count() != size:
+                    continue
+                for position in mask_values(union):
+                    for cover_position, idx in enumerate(cover_lines[position - 1]):
+                        if cover_position not in lines:
+                            removed += _eliminate_mask(state, idx, mask)
+    return removed
+
+
+def naked_pairs(state):
+    return _naked_subsets(state, 2)
+
+
+def hidden_pairs(state):
+    return _hidden_subsets(state, 2)
+
+
+def naked_triples(state):
+    return _naked_subsets(state, 3)
+
+
+def hidden_triples(state):
+    return _hidden_subsets(state, 3)
+
+
+def x_wing(state):
+    return _fish(state, 2)
+
+
+def swordfish(state):
+    return _fish(state, 3)
+
+
+# (name, technique) pairs in order of cost
+SINGLES_TECHNIQUES = (
+    ("naked_single", naked_singles),
+    ("hidden_single", hidden_singles),
+)
+
+ELIMINATION_TECHNIQUES = (
+    ("locked_candidates", locked_candidates),
+    ("naked_pair", naked_pairs),
+    ("hidden_pair", hidden_pairs),
+    ("naked_triple", naked_triples),
+    ("hidden_triple", hidden_triples),
+    ("x_wing", x_wing),
+    ("swordfish", swordfish),
+)
+
+TECHNIQUES = SINGLES_TECHNIQUES + ELIMINATION_TECHNIQUES
+
+TECHNIQUE_NAMES = tuple(name for name, _ in TECHNIQUES)
+
+
+def apply_first(state, techniques=ELIMINATION_TECHNIQUES, counts=None):
+    """Runs techniques in order until one makes progress.
+    Returns the name of that technique, or None if all of them stalled"""
+
+    for name, technique in techniques:
+        changes = technique(state)
+        if changes:
+            if counts is not None:
+                counts[name] = counts.get(name, 0) + changes
+            return name
+    return None
+
+
+def apply_techniques(state, techniques=TECHNIQUES, counts=None):
+    """Applies techniques until none make progress, going back to the
+    cheapest one after every step.  Returns True if the state is solved.
+
+    If counts is a dict it is updated with the changes made by each
+    technique."""
+
+    while not state.is_solved():
+        if apply_first(state, techniques, counts) is None:
+            return False
+    return True
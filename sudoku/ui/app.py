@@ -8,8 +8,9 @@ from .widgets.board import SudokuBoardWidget
 
 class Application(ttk.Frame):
 
-    def __init__(self, root):
+    def __init__(self, root, box_size=3):
         ttk.Frame.__init__(self, root)
+        self.box_size = box_size
         self.setup_widgets()
 
 
@@ -20,7 +21,7 @@ class Application(ttk.Frame):
         self.input_value = tk.IntVar(self, 1, "Sudoku_Spinbox")
         self.setup_menu().grid(row=0, column=0, ipadx=5, pady=10, padx=10)
         
-        self.board = SudokuBoardWidget(self, self.input_value)
+        self.board = SudokuBoardWidget(self, self.input_value, box_size=self.box_size)
         self.board.grid(row=0, column=1, ipadx=10, ipady=10, padx=10, pady=10, sticky=NEWS)
         self.board.set_aspect_ratio()
 
@@ -29,7 +30,7 @@ class Application(ttk.Frame):
 
         menu = ttk.Frame(self)
         ttk.Button(menu, text="Clear", command=self.onClearButton).pack()
-        ttk.Spinbox(menu, from_=1, to=9, width=2, textvariable=self.input_value).pack(pady=10)
+        ttk.Spinbox(menu, from_=1, to=self.box_size ** 2, width=2, textvariable=self.input_value).pack(pady=10)
         ttk.Button(menu, text="Save to File", command=self.onSaveToFile).pack()
         ttk.Button(menu, text="Load from File", command=self.onLoadFromFile).pack()
         return menu
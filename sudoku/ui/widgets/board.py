@@ -1,13 +1,15 @@
 
 from . import tk, ttk, NEWS
 from .sub_square import SudokuSubSquareWidget
+from sudoku.data import get_geometry
 
 class SudokuBoardWidget(ttk.Frame):
 
-    def __init__(self, root, new_value, size=600 ):
+    def __init__(self, root, new_value, size=600, box_size=3):
         ttk.Frame.__init__(self, root, width=size, height=size)
         self.content_frame = ttk.Frame(root)
-        self.data = [ tk.StringVar(self) for _ in range(81)]    
+        self.box_size = box_size
+        self.data = [ tk.StringVar(self) for _ in range(get_geometry(box_size).n_cells)]    
         self.rowconfigure(0, weight=1)
         self.columnconfigure(0, weight=1)
         self.input_value = new_value
@@ -17,18 +19,20 @@ class SudokuBoardWidget(ttk.Frame):
 
     def setup_widgets(self):
 
-        for i in range(3):
+        box_size = self.box_size
+        for i in range(box_size):
             self.content_frame.rowconfigure(i, weight=1)
             self.content_frame.columnconfigure(i, weight=1)
 
-            for j in range(3):
-                idx = 3 * i + j
+            for j in range(box_size):
+                idx = box_size * i + j
                 sub_square_widget = SudokuSubSquareWidget(
                     self.content_frame, 
                     idx, 
                     self.data, 
                     update_callback=self.update_data,
-                    remove_callback=self.remove_data)
+                    remove_callback=self.remove_data,
+                    box_size=box_size)
                 sub_square_widget.grid(row=i, column=j, sticky=NEWS)
 
         # self.bind("<Button-1>", self.update_data)
@@ -1,5 +1,5 @@
 from . import tk, ttk, NEWS
-from sudoku.data import SudokuData
+from sudoku.data import get_geometry
 
 class SudokuButton(ttk.Button):
     def __init__(self, idx, *args, **kwargs):
@@ -9,15 +9,16 @@ class SudokuButton(ttk.Button):
 
 class SudokuSubSquareWidget(ttk.Frame):
 
-    def __init__(self, root, sub_square, data, update_callback=None, remove_callback=None):
+    def __init__(self, root, sub_square, data, update_callback=None, remove_callback=None, box_size=3):
         tk.Frame.__init__(self, root, border=2, highlightthickness=1, highlightbackground="gray")
         self.sub_square = sub_square
+        self.box_size = box_size
         self.update_callback = update_callback
         self.remove_callback = remove_callback
         self.setup_widgets(data)
 
     def setup_widgets(self, data):
-        data_indices = SudokuData.subsquare_indices(self.sub_square)
+        data_indices = iter(get_geometry(self.box_size).subsquare_idxs[self.sub_square])
 
         def update_index(idx):
             return lambda: self.update_callback(idx) if self.update_callback else None
@@ -26,11 +27,11 @@ class SudokuSubSquareWidget(ttk.Frame):
             return lambda _: self.remove_callback(idx) if self.remove_callback else None
 
         
-        for i in range(3):
+        for i in range(self.box_size):
             self.rowconfigure(i, weight=1)
             self.columnconfigure(i, weight=1)
 
-            for j in range(3):
+            for j in range(self.box_size):
                 data_idx = next(data_indices)
                 btn = SudokuButton(
                     data_idx,
@@ -1,4 +1,16 @@
-from sudoku.data import SudokuData
+from sudoku.data import SudokuData, box_size_for
+
+# Characters accepted as an empty cell in the line format
+EMPTY_CHARS = ".0"
+
+# Character of each value in the line format, values above 9 are letters
+# so 16x16 and 25x25 puzzles still have one character per cell
+VALUE_CHARS = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+CHAR_VALUES = dict((char, value) for value, char in enumerate(VALUE_CHARS, 1))
+CHAR_VALUES.update((char.lower(), value) for char, value in tuple(CHAR_VALUES.items()))
+
+PUZZLE_FORMATS = ("comma", "line")
+
 
 def write_to_file(file, data):
     file.write(",".join(data))
@@ -6,13 +18,64 @@ def write_to_file(file, data):
 
 def read_from_file(file):
     
-    data = file.read().strip().split(',')
+    data = file.read()
     file.close()
 
-    def validate(el):
-        try:
-            return int(el)
-        except (TypeError, ValueError):
-            return None
+    return parse_puzzle(data)
+
+def parse_puzzle(line):
+    """Parses a single puzzle, either comma separated with empty fields for
+    empty cells, or one character per cell with '.' or '0' for empty cells.
+    The board size follows from the number of cells, 81 for 9x9 puzzles"""
+
+    line = line.strip()
+
+    if "," in line:
+        def validate(el):
+            try:
+                return int(el)
+            except (TypeError, ValueError):
+                return None
+
+        return SudokuData(list(map(validate, line.split(','))))
+
+    size = box_size_for(len(line)) ** 2
+    cells = [None if char in EMPTY_CHARS else CHAR_VALUES.get(char, 0) for char in line]
+    for char, value in zip(line, cells):
+        if value is not None and not 0 < value <= size:
+            raise ValueError(f"Unexpected character {char!r}")
+    return SudokuData(cells)
+
+def format_puzzle(data, fmt="comma"):
+    """Formats a puzzle as a single line without a line ending"""
+
+    if fmt == "comma":
+        return ",".join("" if value is None else str(value) for value in data)
+    if fmt == "line":
+        return "".join("." if value is None else VALUE_CHARS[value - 1] for value in data)
+    raise ValueError(f"Unknown puzzle format {fmt}")
+
+def iter_puzzle_lines(file):
+    """Yields the puzzle lines of a file one at a time, skipping blank and '#' comment lines"""
+
+    for line in file:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+def iter_puzzles(file):
+    """Lazily yields SudokuData for each puzzle line of a file.
+    The file is read one line at a time and is not closed"""
+
+    for line in iter_puzzle_lines(file):
+        yield parse_puzzle(line)
+
+def write_puzzles(file, puzzles, fmt="comma"):
+    """Writes puzzles to a file one per line, returning the number written.
+    The file is not closed"""
 
-    return SudokuData(list(map(validate, data)))
\ No newline at end of file
+    count = 0
+    for puzzle in puzzles:
+        file.write(format_puzzle(puzzle, fmt) + "\n")
+        count += 1
+    return count
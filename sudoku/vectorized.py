@@ -0,0 +1,72 @@
+"""Batch operations over NumPy arrays of boards, 0 for empty cells."""
+import numpy as np
+
+from .data import DataState
+
+# Boards are checked in blocks of this many so intermediates stay in cache
+BLOCK_SIZE = 4096
+
+# Each cell value is coded as its candidate bit, 1 << (value - 1), in the low
+# 12 bits plus a count of 1 from bit 12 up.  The sum of a unit's codes then
+# holds the OR of its bits when no value repeats, and a unit has no repeats
+# exactly when the popcount of the low bits equals the count.  Values out of
+# range are coded as a count without a bit so they always fail the check.
+COUNT_SHIFT = 12
+INVALID_VALUE = 10
+
+CELL_CODES = np.full(256, 1 << COUNT_SHIFT, dtype=np.uint16)
+CELL_CODES[0] = 0
+CELL_CODES[1:10] = [(1 << (value - 1)) | (1 << COUNT_SHIFT) for value in range(1, 10)]
+
+UNIT_OK = np.array(
+    [bin(code & ((1 << COUNT_SHIFT) - 1)).count("1") == code >> COUNT_SHIFT for code in range(1 << 16)],
+    dtype=bool
+)
+
+# Unit sums of at least this have all 9 cells filled
+FULL_UNIT = 9 << COUNT_SHIFT
+
+
+def _check_block(boards):
+    codes = CELL_CODES[boards]
+
+    # Sum each row's cells within each stack, giving (n, row, stack) triples
+    # that add up to both the row and the subsquare sums
+    cells = codes.reshape(-1, 9, 3, 3)
+    triples = cells[..., 0] + cells[..., 1] + cells[..., 2]
+    rows = triples[..., 0] + triples[..., 1] + triples[..., 2]
+
+    bands = triples.reshape(-1, 3, 3, 3)
+    sub_squares = bands[:, :, 0, :] + bands[:, :, 1, :] + bands[:, :, 2, :]
+
+    columns = codes[:, 0, :] + codes[:, 1, :]
+    for row in range(2, 9):
+        columns += codes[:, row, :]
+
+    valid = UNIT_OK[rows].all(axis=1)
+    valid &= UNIT_OK[columns].all(axis=1)
+    valid &= UNIT_OK[sub_squares].all(axis=(1, 2))
+    complete = valid & (rows >= FULL_UNIT).all(axis=1)
+
+    states = np.full(len(boards), DataState.ERROR.value, dtype=np.int8)
+    states[valid] = DataState.VALID.value
+    states[complete] = DataState.COMPLETE.value
+    return states
+
+
+def check_boards(boards):
+    """Checks a batch of boards, an (N, 9, 9) or (N, 81) integer array.
+
+    Returns an (N, ) int8 array of DataState values, the same result as
+    SudokuData.check gives for each board."""
+
+    boards = np.asarray(boards)
+    boards = boards.reshape(len(boards), 9, 9)
+    if boards.dtype != np.uint8:
+        boards = np.where((boards < 0) | (boards > 9), INVALID_VALUE, boards).astype(np.uint8)
+
+    states = np.empty(len(boards), dtype=np.int8)
+    for start in range(0, len(boards), BLOCK_SIZE):
+        stop = start + BLOCK_SIZE
+        states[start:stop] = _check_block(boards[start:stop])
+    return states
@@ -0,0 +1,84 @@
+import unittest
+
+from sudoku.budget import Budget, BudgetExceeded
+from sudoku.parallel import ParallelSolver
+from sudoku.search import SearchSolver, iter_solutions
+from sudoku.solver import SOLVER_NAMES, BruteForceSolver, get_solver
+from sudoku.utils import parse_puzzle
+
+# Needs search from every solver, the passes alone stall on it
+HARD = "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+HARD_SOLUTION = "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+
+
+class SolverBudgetTest(unittest.TestCase):
+
+    def solve(self, name, budget):
+        try:
+            solver = get_solver(name)
+        except ImportError:
+            self.skipTest(f"{name} is not installed")
+        return solver(parse_puzzle(HARD), budget=budget).solve()
+
+    def assertExceeded(self, result, reason):
+        self.assertIsInstance(result, BudgetExceeded)
+        self.assertFalse(result)
+        self.assertEqual(result.reason, reason)
+
+    def test_node_limit(self):
+        for name in SOLVER_NAMES:
+            with self.subTest(solver=name):
+                result = self.solve(name, Budget(max_nodes=1))
+                self.assertExceeded(result, "nodes")
+                self.assertEqual(result.nodes, 2)
+
+    def test_time_limit(self):
+        for name in SOLVER_NAMES:
+            with self.subTest(solver=name):
+                self.assertExceeded(self.solve(name, Budget(timeout=0)), "time")
+
+    def test_cancelled(self):
+        for name in SOLVER_NAMES:
+            with self.subTest(solver=name):
+                budget = Budget()
+                budget.cancel()
+                self.assertExceeded(self.solve(name, budget), "cancelled")
+
+    def test_within_budget(self):
+        for name in SOLVER_NAMES:
+            with self.subTest(solver=name):
+                result = self.solve(name, Budget(timeout=60))
+                self.assertEqual(result, parse_puzzle(HARD_SOLUTION))
+
+
+class CountBudgetTest(unittest.TestCase):
+
+    def test_search_count(self):
+        solver = SearchSolver(parse_puzzle(HARD), budget=Budget(max_nodes=3))
+        result = solver.count_solutions()
+        self.assertIsInstance(result, BudgetExceeded)
+        self.assertEqual(result.reason, "nodes")
+        self.assertEqual(solver.solutions, 0)
+
+    def test_brute_force_count(self):
+        result = BruteForceSolver(parse_puzzle(HARD), budget=Budget(max_nodes=3)).count_solutions()
+        self.assertIsInstance(result, BudgetExceeded)
+        self.assertEqual(result.reason, "nodes")
+
+    def test_iter_solutions(self):
+        # The last item of an exhausted budget is its BudgetExceeded
+        results = list(iter_solutions(parse_puzzle(HARD), budget=Budget(max_nodes=3)))
+        self.assertEqual(len(results), 1)
+        self.assertIsInstance(results[0], BudgetExceeded)
+        self.assertEqual(results[0].reason, "nodes")
+
+    def test_parallel(self):
+        for budget, reason in ((Budget(max_nodes=1), "nodes"), (Budget(timeout=0), "time")):
+            with self.subTest(reason=reason):
+                result = ParallelSolver(parse_puzzle(HARD), budget=budget, workers=2).solve()
+                self.assertIsInstance(result, BudgetExceeded)
+                self.assertEqual(result.reason, reason)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import random
+import unittest
+
+from sudoku.cache import SolutionCache
+from sudoku.canonical import canonical_key, canonicalize, random_transform
+from sudoku.search import SearchSolver
+from sudoku.stats import SolverStats
+from sudoku.utils import parse_puzzle
+
+PUZZLES = (
+    "85...24..72......9..4.........1.7..23.5...9...4...........8..7..17..........36.4.",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "9..1.4..2.8..6..7..........4.......1.7.....3.3.......7..........3..7..8.1..2.9..4",
+)
+
+# Every line of a complete grid has the same keys, so every ordering ties
+COMPLETE = "859612437723854169164379528986147352375268914241593786432981675617425893598736241"
+
+SEEDS = range(8)
+
+
+def agrees_with_givens(solution, puzzle):
+    return all(given is None or given == value for given, value in zip(puzzle, solution))
+
+
+class CanonicalFormTest(unittest.TestCase):
+
+    def test_invariant_under_transforms(self):
+        for line in PUZZLES:
+            puzzle = parse_puzzle(line)
+            key = canonical_key(puzzle)
+            self.assertIsNotNone(key)
+            for seed in SEEDS:
+                with self.subTest(puzzle=line, seed=seed):
+                    transformed = random_transform(random.Random(seed)).apply(puzzle)
+                    self.assertEqual(canonical_key(transformed), key)
+
+    def test_transform_round_trip(self):
+        for line in PUZZLES:
+            puzzle = parse_puzzle(line)
+            for seed in SEEDS:
+                with self.subTest(puzzle=line, seed=seed):
+                    transform = random_transform(random.Random(seed))
+                    self.assertEqual(transform.invert(transform.apply(puzzle)), puzzle)
+
+    def test_canonical_transform(self):
+        # The returned transform takes the puzzle to its canonical form and back
+        for line in PUZZLES:
+            with self.subTest(puzzle=line):
+                puzzle = parse_puzzle(line)
+                canonical, transform = canonicalize(puzzle)
+                self.assertEqual(transform.apply(puzzle), canonical)
+                self.assertEqual(transform.invert(canonical), puzzle)
+
+    def test_no_canonical_form(self):
+        self.assertIsNone(canonicalize(parse_puzzle(COMPLETE)))
+        self.assertIsNone(canonical_key(parse_puzzle(COMPLETE)))
+
+
+class SolutionCacheTest(unittest.TestCase):
+
+    def test_hit_on_transformed_puzzle(self):
+        cache = SolutionCache()
+        for line in PUZZLES:
+            puzzle = parse_puzzle(line)
+            self.assertTrue(cache.solve(puzzle).is_puzzle_solved())
+        self.assertEqual((cache.hits, cache.misses), (0, len(PUZZLES)))
+
+        for line in PUZZLES:
+            for seed in SEEDS:
+                with self.subTest(puzzle=line, seed=seed):
+                    transformed = random_transform(random.Random(seed)).apply(parse_puzzle(line))
+                    hits = cache.hits
+                    solution = cache.get(transformed)
+                    self.assertEqual(cache.hits, hits + 1)
+                    self.assertTrue(solution.is_puzzle_solved())
+                    self.assertTrue(agrees_with_givens(solution, transformed))
+                    self.assertEqual(solution, SearchSolver(transformed).solve())
+
+    def test_read_through(self):
+        cache = SolutionCache()
+        stats = SolverStats()
+        puzzle = parse_puzzle(PUZZLES[0])
+        calls = []
+
+        def solve():
+            calls.append(puzzle)
+            return SearchSolver(puzzle).solve()
+
+        first = cache.read_through(puzzle, solve, stats)
+        transformed = random_transform(random.Random(0)).apply(puzzle)
+        second = cache.read_through(transformed, solve, stats)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(stats.counters.get("cache_hits"), 1)
+        self.assertEqual(first, SearchSolver(puzzle).solve())
+        self.assertTrue(agrees_with_givens(second, transformed))
+        self.assertTrue(second.is_puzzle_solved())
+
+    def test_unsolvable_not_cached(self):
+        cache = SolutionCache()
+        puzzle = parse_puzzle("1234.6789" + "....5...." + "." * 63)
+        self.assertIsNone(cache.solve(puzzle))
+        self.assertIsNone(cache.solve(puzzle))
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 2))
+
+    def test_no_canonical_form_not_cached(self):
+        cache = SolutionCache()
+        puzzle = parse_puzzle(COMPLETE)
+        self.assertTrue(cache.solve(puzzle).is_puzzle_solved())
+        self.assertFalse(cache.put(puzzle, SearchSolver(puzzle).solve()))
+        self.assertEqual((len(cache), cache.misses), (0, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = SolutionCache(maxsize=2)
+        puzzles = [parse_puzzle(line) for line in PUZZLES]
+        for puzzle in puzzles:
+            cache.solve(puzzle)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(puzzles[0]))
+        self.assertIsNotNone(cache.get(puzzles[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from sudoku.data import SudokuData
+
+
+def solved_grid(box_size):
+    # Valid solved board from the usual shifted pattern
+    size = box_size * box_size
+    return [
+        (box_size * (row % box_size) + row // box_size + column) % size + 1
+        for row in range(size) for column in range(size)
+    ]
+
+
+class SixteenBySixteenTest(unittest.TestCase):
+    """The *_from_idx lookups and iterators on a 16x16 board"""
+
+    def setUp(self):
+        self.solution = solved_grid(4)
+        cells = list(self.solution)
+        # Leave the first cell of every row empty
+        for row in range(16):
+            cells[16 * row] = None
+        self.data = SudokuData(cells)
+        self.cells = cells
+
+    def test_solution_is_valid(self):
+        self.assertTrue(SudokuData(self.solution).is_puzzle_solved())
+
+    def test_unit_from_idx(self):
+        # Cell 20 is row 1, column 4, subsquare 1 and cell 150 is row 9,
+        # column 6, subsquare 9, which differ from a 9x9 board
+        self.assertEqual(self.data.row_from_idx(20), 1)
+        self.assertEqual(self.data.column_from_idx(20), 4)
+        self.assertEqual(self.data.subsquare_from_idx(20), 1)
+        self.assertEqual(self.data.row_from_idx(150), 9)
+        self.assertEqual(self.data.column_from_idx(150), 6)
+        self.assertEqual(self.data.subsquare_from_idx(150), 9)
+        self.assertEqual(self.data.row_from_idx(255), 15)
+        self.assertEqual(self.data.subsquare_from_idx(255), 15)
+
+    def test_iter_from_idx(self):
+        self.assertEqual(self.data.iter_row_from_idx(20), tuple(self.cells[16:32]))
+        self.assertEqual(self.data.iter_column_from_idx(20), tuple(self.cells[4::16]))
+        self.assertEqual(
+            self.data.iter_subsquare_from_idx(150),
+            tuple(self.cells[16 * row + column] for row in range(8, 12) for column in range(4, 8))
+        )
+
+    def test_iter_valid_from_idx(self):
+        # Only the empty cells are not initials
+        self.assertEqual(self.data.iter_valid_row_from_idx(20), (None, ))
+        self.assertEqual(self.data.iter_valid_column_from_idx(20), ())
+        self.assertEqual(self.data.iter_valid_column_from_idx(16), (None, ) * 16)
+        self.assertEqual(self.data.iter_valid_subsquare_from_idx(150), ())
+        self.assertEqual(self.data.iter_valid_subsquare_from_idx(128), (None, ) * 4)
+
+    def test_all_numbers(self):
+        self.assertEqual(self.data.ALL_NUMBERS, set(range(1, 17)))
+
+    def test_unit_indices(self):
+        self.assertEqual(self.data.row_indices(15), tuple(range(240, 256)))
+        self.assertEqual(self.data.column_indices(15, ignore={15}), tuple(range(31, 256, 16)))
+        self.assertEqual(self.data.subsquare_indices(15)[-1], 255)
+        self.assertEqual(len(self.data.superrow_indices(3)), 64)
+        self.assertTrue(self.data.is_row_in_subsquare(7, 5))
+        self.assertTrue(self.data.is_column_in_subsquare(13, 7))
+        with self.assertRaises(ValueError):
+            self.data.row_indices(16)
+
+
+if __name__ == "__main__":
+    unittest.main()
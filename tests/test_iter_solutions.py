@@ -0,0 +1,79 @@
+import unittest
+from itertools import islice
+
+from sudoku.search import SearchSolver, count_solutions, iter_solutions
+from sudoku.solver import SudokuSolver
+from sudoku.utils import format_puzzle, parse_puzzle
+
+UNIQUE = "85...24..72......9..4.........1.7..23.5...9...4...........8..7..17..........36.4."
+
+# A solved grid with its first 26 cells cleared, which has 72 solutions
+MULTIPLE = "..........................8986147352375268914241593786432981675617425893598736241"
+MULTIPLE_COUNT = 72
+
+# Two 1s in the first row
+CONFLICTING = "11" + "." * 79
+
+
+def agrees_with_givens(solution, puzzle):
+    return all(given is None or given == value for given, value in zip(puzzle, solution))
+
+
+class IterSolutionsTest(unittest.TestCase):
+
+    def test_every_solution_once(self):
+        puzzle = parse_puzzle(MULTIPLE)
+        solutions = list(iter_solutions(puzzle))
+        self.assertEqual(len(solutions), MULTIPLE_COUNT)
+        self.assertEqual(len(solutions), count_solutions(puzzle, limit=None))
+        self.assertEqual(len(set(format_puzzle(solution, "line") for solution in solutions)), MULTIPLE_COUNT)
+        for solution in solutions:
+            self.assertTrue(solution.is_puzzle_solved())
+            self.assertTrue(agrees_with_givens(solution, puzzle))
+
+    def test_order(self):
+        # The same order on every run, starting with the solution solve() finds
+        puzzle = parse_puzzle(MULTIPLE)
+        solutions = list(iter_solutions(puzzle))
+        self.assertEqual(list(iter_solutions(puzzle)), solutions)
+        self.assertEqual(solutions[0], SearchSolver(puzzle).solve())
+
+        solver = SearchSolver(puzzle)
+        solver.count_solutions(limit=None)
+        self.assertEqual(solutions[0], solver.first_solution)
+
+    def test_unique(self):
+        puzzle = parse_puzzle(UNIQUE)
+        self.assertEqual(list(iter_solutions(puzzle)), [SearchSolver(puzzle).solve()])
+
+    def test_stop_early(self):
+        # Closing the generator rolls the state back, so the solver can
+        # start over
+        puzzle = parse_puzzle(MULTIPLE)
+        solver = SearchSolver(puzzle)
+        before = solver.state.to_data()
+        solutions = solver.iter_solutions()
+        first = list(islice(solutions, 5))
+        solutions.close()
+        self.assertEqual(solver.state.to_data(), before)
+        self.assertEqual(solver.solutions, 5)
+        self.assertEqual(list(islice(solver.iter_solutions(), 5)), first)
+
+    def test_passes_then_search(self):
+        # SudokuSolver runs the passes first and yields the same solutions
+        puzzle = parse_puzzle(MULTIPLE)
+        solutions = set(format_puzzle(solution, "line") for solution in SudokuSolver(puzzle).iter_solutions())
+        expected = set(format_puzzle(solution, "line") for solution in iter_solutions(puzzle))
+        self.assertEqual(solutions, expected)
+
+        puzzle = parse_puzzle(UNIQUE)
+        self.assertEqual(list(SudokuSolver(puzzle).iter_solutions()), [SearchSolver(puzzle).solve()])
+
+    def test_conflicting_givens(self):
+        puzzle = parse_puzzle(CONFLICTING)
+        self.assertEqual(list(iter_solutions(puzzle)), [])
+        self.assertEqual(list(SudokuSolver(puzzle).iter_solutions()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
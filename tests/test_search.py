@@ -0,0 +1,68 @@
+import unittest
+
+from sudoku.search import SearchSolver, count_solutions, has_unique_solution
+from sudoku.solver import BruteForceSolver
+from sudoku.utils import parse_puzzle
+
+UNIQUE = "85...24..72......9..4.........1.7..23.5...9...4...........8..7..17..........36.4."
+
+# The solution of UNIQUE with its first 24 cells cleared, which has 12
+# solutions
+MULTIPLE = "........................528986147352375268914241593786432981675617425893598736241"
+MULTIPLE_COUNT = 12
+
+# Two 1s in the first row
+CONFLICTING = "11" + "." * 79
+
+
+class CountSolutionsTest(unittest.TestCase):
+
+    def test_unique(self):
+        puzzle = parse_puzzle(UNIQUE)
+        self.assertEqual(count_solutions(puzzle), 1)
+        self.assertEqual(count_solutions(puzzle, limit=None), 1)
+        self.assertTrue(has_unique_solution(puzzle))
+
+    def test_limit(self):
+        puzzle = parse_puzzle(MULTIPLE)
+        self.assertEqual(count_solutions(puzzle), 2)
+        self.assertEqual(count_solutions(puzzle, limit=5), 5)
+        self.assertEqual(count_solutions(puzzle, limit=MULTIPLE_COUNT + 1), MULTIPLE_COUNT)
+        self.assertFalse(has_unique_solution(puzzle))
+
+    def test_count_all(self):
+        # Counted by search and by the brute force solver independently
+        puzzle = parse_puzzle(MULTIPLE)
+        self.assertEqual(count_solutions(puzzle, limit=None), MULTIPLE_COUNT)
+        self.assertEqual(BruteForceSolver(puzzle).count_solutions(limit=None), MULTIPLE_COUNT)
+
+    def test_first_solution(self):
+        puzzle = parse_puzzle(MULTIPLE)
+        solver = SearchSolver(puzzle)
+        solver.count_solutions(limit=None)
+        self.assertTrue(solver.first_solution.is_puzzle_solved())
+        self.assertEqual(solver.first_solution, SearchSolver(puzzle).solve())
+
+    def test_count_leaves_state(self):
+        puzzle = parse_puzzle(MULTIPLE)
+        solver = SearchSolver(puzzle)
+        before = solver.state.to_data()
+        solver.count_solutions(limit=None)
+        self.assertEqual(solver.state.to_data(), before)
+
+    def test_conflicting_givens(self):
+        puzzle = parse_puzzle(CONFLICTING)
+        self.assertEqual(count_solutions(puzzle), 0)
+        self.assertEqual(count_solutions(puzzle, limit=None), 0)
+        self.assertFalse(has_unique_solution(puzzle))
+        self.assertIsNone(SearchSolver(puzzle).solve())
+
+    def test_no_solution(self):
+        # The first row can not take a 5 anywhere but its blank cell, which
+        # its column already has
+        puzzle = parse_puzzle("1234.6789" + "....5...." + "." * 63)
+        self.assertEqual(count_solutions(puzzle, limit=None), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
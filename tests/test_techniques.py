@@ -0,0 +1,70 @@
+import unittest
+
+from sudoku.candidates import CandidateState, bit
+from sudoku.search import SearchSolver
+from sudoku.techniques import ELIMINATION_TECHNIQUES, SINGLES_TECHNIQUES, TECHNIQUE_NAMES, apply_first, apply_techniques
+from sudoku.utils import parse_puzzle
+
+# Puzzles whose logical solves need every technique between them
+SOLVABLE = (
+    "85...24..72......9..4.........1.7..23.5...9...4...........8..7..17..........36.4.",
+    "1.....569492.561.8.561.924...964.8.1.64.1....218.356.4.4.5...169.5.614.2621.....5",
+    "1.8....67....5...........3...61...4.45....9......93...2...4..1...3..27..8.7..1..5",
+    "9..1.4..2.8..6..7..........4.......1.7.....3.3.......7..........3..7..8.1..2.9..4",
+)
+
+# A puzzle the techniques stall on after some eliminations
+STALLS = "..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97.."
+
+
+class TechniqueSoundnessTest(unittest.TestCase):
+    """Every deduction keeps the unique solution of the puzzle"""
+
+    def assertKeepsSolution(self, state, solution, name):
+        for idx, value in enumerate(solution):
+            if state.cells[idx]:
+                self.assertEqual(state.cells[idx], value, f"{name} placed a wrong value in cell {idx}")
+            else:
+                self.assertTrue(state.candidates[idx] & bit(value), f"{name} removed the solution from cell {idx}")
+
+    def test_each_technique_keeps_solution(self):
+        # Wherever the singles stall every elimination technique is tried on
+        # its own, then the solve goes on with the first that progresses
+        fired = set()
+        for line in SOLVABLE + (STALLS, ):
+            with self.subTest(puzzle=line):
+                puzzle = parse_puzzle(line)
+                solution = SearchSolver(puzzle).solve().data
+                state = CandidateState(puzzle)
+                while not state.is_solved():
+                    if apply_first(state, SINGLES_TECHNIQUES):
+                        self.assertKeepsSolution(state, solution, "singles")
+                        continue
+                    for name, technique in ELIMINATION_TECHNIQUES:
+                        trial = state.copy()
+                        if technique(trial):
+                            fired.add(name)
+                            self.assertKeepsSolution(trial, solution, name)
+                    if apply_first(state, ELIMINATION_TECHNIQUES) is None:
+                        break
+
+        self.assertEqual(fired, set(name for name, _ in ELIMINATION_TECHNIQUES))
+
+    def test_apply_techniques_solves(self):
+        for line in SOLVABLE:
+            with self.subTest(puzzle=line):
+                puzzle = parse_puzzle(line)
+                state = CandidateState(puzzle)
+                counts = {}
+                self.assertTrue(apply_techniques(state, counts=counts))
+                self.assertEqual(state.to_data().data, SearchSolver(puzzle).solve().data)
+                self.assertTrue(set(counts) <= set(TECHNIQUE_NAMES))
+
+    def test_apply_techniques_stalls(self):
+        state = CandidateState(parse_puzzle(STALLS))
+        self.assertFalse(apply_techniques(state))
+        self.assertFalse(state.is_solved())
+
+
+if __name__ == "__main__":
+    unittest.main()